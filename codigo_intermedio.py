@@ -1,10 +1,16 @@
+import re
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, TextIO, Union
 from sintactico import (
     ASTNode, ProgramNode, VarDeclarationNode, AssignmentNode,
     BinaryOpNode, UnaryOpNode, NumberNode, IdentifierNode,
     IfNode, WhileNode, PrintNode
 )
+from recorrido import NodeVisitor
+from semantico import SemanticAnalyzer, SemanticError
+
+
+TEMP_NAME = re.compile(r't\d+$')
 
 
 @dataclass
@@ -37,11 +43,28 @@ class ThreeAddressCode:
             return f"{self.op} {self.arg1} {self.arg2} {self.result}"
 
 
-class IntermediateCodeGenerator:
+def print_code(code: List[ThreeAddressCode], file: Optional[TextIO] = None):
+    print("\n" + "="*80, file=file)
+    print("CODIGO INTERMEDIO (CODIGO DE TRES DIRECCIONES)", file=file)
+    print("="*80, file=file)
+    print(f"{'#':<5} {'Instruccion':<50}", file=file)
+    print("-"*80, file=file)
+
+    for i, instruction in enumerate(code):
+        print(f"{i:<5} {str(instruction):<50}", file=file)
+
+    print("="*80, file=file)
+    print(f"Total de instrucciones: {len(code)}", file=file)
+    print("="*80 + "\n", file=file)
+
+
+class IntermediateCodeGenerator(NodeVisitor):
     def __init__(self):
         self.code: List[ThreeAddressCode] = []
         self.temp_counter = 0
         self.label_counter = 0
+        self.slot_operands: Dict[int, str] = {}
+        self.operand_slots: Dict[str, int] = {}
 
     def new_temp(self) -> str:
         temp = f"t{self.temp_counter}"
@@ -53,46 +76,62 @@ class IntermediateCodeGenerator:
         self.label_counter += 1
         return label
 
+    def variable(self, name: str, slot: int) -> str:
+        if slot < 0:
+            return name
+
+        operand = self.slot_operands.get(slot)
+        if operand is None:
+            if name in self.operand_slots or TEMP_NAME.match(name):
+                operand = f"{name}.{slot}"
+            else:
+                operand = name
+            self.slot_operands[slot] = operand
+            self.operand_slots[operand] = slot
+        return operand
+
     def emit(self, op: str, arg1: Optional[str] = None,
              arg2: Optional[str] = None, result: Optional[str] = None):
         instruction = ThreeAddressCode(op, arg1, arg2, result)
         self.code.append(instruction)
 
     def generate(self, ast: ASTNode) -> List[ThreeAddressCode]:
-        self.code = []
-        self.temp_counter = 0
-        self.label_counter = 0
+        self.reset()
         self.visit(ast)
         return self.code
 
-    def visit(self, node: ASTNode) -> Optional[str]:
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+    def reset(self):
+        self.code = []
+        self.temp_counter = 0
+        self.label_counter = 0
+        self.slot_operands = {}
+        self.operand_slots = {}
 
-    def generic_visit(self, node: ASTNode):
-        raise Exception(f"No existe metodo visit_{type(node).__name__}")
+    def generate_statement(self, statement: ASTNode) -> List[ThreeAddressCode]:
+        self.code = []
+        self.visit(statement)
+        return self.code
 
     def visit_ProgramNode(self, node: ProgramNode) -> None:
         for statement in node.statements:
-            self.visit(statement)
+            yield statement
 
     def visit_VarDeclarationNode(self, node: VarDeclarationNode) -> None:
         pass
 
     def visit_AssignmentNode(self, node: AssignmentNode) -> None:
-        expr_result = self.visit(node.expression)
-        self.emit('ASSIGN', expr_result, None, node.identifier)
+        expr_result = yield node.expression
+        self.emit('ASSIGN', expr_result, None, self.variable(node.identifier, node.slot))
 
     def visit_BinaryOpNode(self, node: BinaryOpNode) -> str:
-        left_result = self.visit(node.left)
-        right_result = self.visit(node.right)
+        left_result = yield node.left
+        right_result = yield node.right
         temp = self.new_temp()
         self.emit(node.operator, left_result, right_result, temp)
         return temp
 
     def visit_UnaryOpNode(self, node: UnaryOpNode) -> str:
-        operand_result = self.visit(node.operand)
+        operand_result = yield node.operand
         temp = self.new_temp()
 
         if node.operator == '-':
@@ -106,24 +145,24 @@ class IntermediateCodeGenerator:
         return str(node.value)
 
     def visit_IdentifierNode(self, node: IdentifierNode) -> str:
-        return node.name
+        return self.variable(node.name, node.slot)
 
     def visit_IfNode(self, node: IfNode) -> None:
-        condition_result = self.visit(node.condition)
+        condition_result = yield node.condition
         label_else = self.new_label()
         label_end = self.new_label()
 
         self.emit('IF_FALSE', condition_result, None, label_else)
 
         for stmt in node.then_block:
-            self.visit(stmt)
+            yield stmt
 
         self.emit('GOTO', None, None, label_end)
         self.emit('LABEL', None, None, label_else)
 
         if node.else_block:
             for stmt in node.else_block:
-                self.visit(stmt)
+                yield stmt
 
         self.emit('LABEL', None, None, label_end)
 
@@ -132,32 +171,155 @@ class IntermediateCodeGenerator:
         label_end = self.new_label()
 
         self.emit('LABEL', None, None, label_start)
-        condition_result = self.visit(node.condition)
+        condition_result = yield node.condition
         self.emit('IF_FALSE', condition_result, None, label_end)
 
         for stmt in node.body:
-            self.visit(stmt)
+            yield stmt
 
         self.emit('GOTO', None, None, label_start)
         self.emit('LABEL', None, None, label_end)
 
     def visit_PrintNode(self, node: PrintNode) -> None:
-        expr_result = self.visit(node.expression)
+        expr_result = yield node.expression
         self.emit('PRINT', expr_result, None, None)
 
-    def print_code(self):
-        print("\n" + "="*80)
-        print("CODIGO INTERMEDIO (CODIGO DE TRES DIRECCIONES)")
-        print("="*80)
-        print(f"{'#':<5} {'Instruccion':<50}")
-        print("-"*80)
+    def print_code(self, file: Optional[TextIO] = None):
+        print_code(self.code, file)
+
+
+class SemanticCodeGenerator(IntermediateCodeGenerator):
+    def __init__(self, analyzer: Optional[SemanticAnalyzer] = None):
+        super().__init__()
+        self.analyzer = analyzer if analyzer is not None else SemanticAnalyzer()
+        self.checking = True
+
+    def generate(self, ast: ASTNode) -> List[ThreeAddressCode]:
+        self.reset()
+        self.analyzer.begin(getattr(ast, 'names', None))
+        self.generate_statement(ast)
+        self.analyzer.finish()
+        return self.code
+
+    def generate_statement(self, statement: ASTNode) -> List[ThreeAddressCode]:
+        self.code = []
+        self.checking = True
+
+        try:
+            self.visit(statement)
+        except SemanticError:
+            raise
+        except Exception as e:
+            raise SemanticError(f"Error durante el analisis semantico: {str(e)}")
+
+        self.analyzer.check_flow(statement)
+        return self.code
+
+    def enter_scope(self):
+        self.analyzer.symbol_table.enter_scope()
+
+    def exit_scope(self):
+        self.analyzer.symbol_table.exit_scope()
+
+    def visit_VarDeclarationNode(self, node: VarDeclarationNode) -> None:
+        if self.checking:
+            self.analyzer.visit_VarDeclarationNode(node)
+
+    def visit_AssignmentNode(self, node: AssignmentNode):
+        if not self.checking:
+            _, expr_result = yield node.expression
+            self.emit('ASSIGN', expr_result, None, self.variable(node.identifier, node.slot))
+            return
+
+        analyzer = self.analyzer
+        symbol = analyzer.resolve(node.identifier, node.symbol_id)
+
+        if symbol is None:
+            analyzer.undeclared(node.identifier, node.line)
+            self.checking = False
+            _, expr_result = yield node.expression
+            self.checking = True
+        else:
+            node.slot = symbol.slot
+            _, expr_result = yield node.expression
+            symbol.initialized = True
+
+        self.emit('ASSIGN', expr_result, None, self.variable(node.identifier, node.slot))
+
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        left_type, left_result = yield node.left
+        right_type, right_result = yield node.right
+        temp = self.new_temp()
+        self.emit(node.operator, left_result, right_result, temp)
+
+        if self.checking:
+            return self.analyzer.binary_type(node, left_type, right_type), temp
+        return None, temp
+
+    def visit_UnaryOpNode(self, node: UnaryOpNode):
+        operand_type, operand_result = yield node.operand
+        temp = self.new_temp()
+
+        if node.operator == '-':
+            self.emit('UNARY_MINUS', operand_result, None, temp)
+        elif node.operator == '+':
+            self.emit('UNARY_PLUS', operand_result, None, temp)
+
+        if self.checking:
+            return self.analyzer.unary_type(node, operand_type), temp
+        return None, temp
+
+    def visit_NumberNode(self, node: NumberNode):
+        return self.analyzer.visit_NumberNode(node), str(node.value)
 
-        for i, instruction in enumerate(self.code):
-            print(f"{i:<5} {str(instruction):<50}")
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        if self.checking:
+            data_type = self.analyzer.visit_IdentifierNode(node)
+            return data_type, self.variable(node.name, node.slot)
+        return None, self.variable(node.name, node.slot)
 
-        print("="*80)
-        print(f"Total de instrucciones: {len(self.code)}")
-        print("="*80 + "\n")
+    def visit_IfNode(self, node: IfNode):
+        _, condition_result = yield node.condition
+        label_else = self.new_label()
+        label_end = self.new_label()
+
+        self.emit('IF_FALSE', condition_result, None, label_else)
+
+        self.enter_scope()
+        for stmt in node.then_block:
+            yield stmt
+        self.exit_scope()
+
+        self.emit('GOTO', None, None, label_end)
+        self.emit('LABEL', None, None, label_else)
+
+        if node.else_block:
+            self.enter_scope()
+            for stmt in node.else_block:
+                yield stmt
+            self.exit_scope()
+
+        self.emit('LABEL', None, None, label_end)
+
+    def visit_WhileNode(self, node: WhileNode):
+        label_start = self.new_label()
+        label_end = self.new_label()
+
+        self.emit('LABEL', None, None, label_start)
+        _, condition_result = yield node.condition
+        self.emit('IF_FALSE', condition_result, None, label_end)
+
+        self.enter_scope()
+        for stmt in node.body:
+            yield stmt
+        self.exit_scope()
+
+        self.emit('GOTO', None, None, label_start)
+        self.emit('LABEL', None, None, label_end)
+
+    def visit_PrintNode(self, node: PrintNode):
+        _, expr_result = yield node.expression
+        self.emit('PRINT', expr_result, None, None)
 
 
 if __name__ == "__main__":
@@ -186,7 +348,7 @@ if __name__ == "__main__":
     lexer = Lexer(codigo)
     tokens = lexer.tokenize()
 
-    parser = Parser(tokens)
+    parser = Parser(tokens, lexer.names)
     ast = parser.parse()
 
     generator = IntermediateCodeGenerator()
@@ -1,114 +1,241 @@
+import argparse
+import mmap
 import sys
+import time
+from typing import Any, Callable, Dict, Optional, TextIO, Union
 from lexico import Lexer, LexicalError
 from sintactico import Parser, SyntaxError
 from semantico import SemanticAnalyzer, SemanticError
-from codigo_intermedio import IntermediateCodeGenerator
+from codigo_intermedio import IntermediateCodeGenerator, SemanticCodeGenerator, ThreeAddressCode
+from diagnosticos import Diagnostics
+from resultado import CompilationResult, print_error
+from maquina_virtual import ExecutionError, VirtualMachine
+from generador_python import PythonBackend
+from optimizador import ConstantFolder, DeadCodeEliminator
 
 
 class Compiler:
-    def __init__(self):
+    def __init__(self, diagnostics: Optional[Diagnostics] = None):
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
         self.source_code = ""
         self.tokens = []
         self.ast = None
         self.symbol_table = None
         self.intermediate_code = []
+        self.operand_slots = {}
 
-    def compile(self, source_code: str, verbose: bool = True):
-        self.source_code = source_code
-
-        try:
-            if verbose:
-                print("\n" + "="*80)
-                print("COMPILADOR MINILANG")
-                print("="*80)
-                print("\nFASE 1: ANALISIS LEXICO")
-                print("-"*80)
+    def compile(self, source_code: Union[str, bytes, mmap.mmap], verbose: bool = True,
+                workers: int = 1, fused: bool = False, optimize: bool = False) -> CompilationResult:
+        result = self.compile_result(source_code, workers, fused, optimize)
 
-            lexer = Lexer(source_code)
-            self.tokens = lexer.tokenize()
+        if verbose:
+            result.write_text()
+        elif not result:
+            print_error(result.error_title, result.error)
 
-            if verbose:
-                print(f"Analisis lexico completado: {len(self.tokens)-1} tokens encontrados")
-                lexer.print_tokens()
+        return result
 
-            if verbose:
-                print("\nFASE 2: ANALISIS SINTACTICO")
-                print("-"*80)
+    def compile_result(self, source_code: Union[str, bytes, mmap.mmap], workers: int = 1,
+                       fused: bool = False, optimize: bool = False) -> CompilationResult:
+        self.source_code = source_code
+        result = CompilationResult(source=source_code, diagnostics=self.diagnostics)
+        timings = result.timings
 
-            parser = Parser(self.tokens)
+        try:
+            start = time.perf_counter()
+            lexer = Lexer(source_code)
+            result.lexer = lexer
+            if workers > 1:
+                self.tokens = lexer.tokenize_parallel(workers)
+            elif isinstance(source_code, str):
+                self.tokens = lexer.tokenize()
+            else:
+                self.tokens = lexer.tokenize_buffer()
+            result.tokens = self.tokens
+            timings['lexico'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            parser = Parser(self.tokens, lexer.names, recover=True)
+            result.parser = parser
             self.ast = parser.parse()
+            result.ast = self.ast
+
+            if parser.errors:
+                errors = list(parser.errors)
+                try:
+                    SemanticAnalyzer(self.diagnostics).analyze(self.ast)
+                except SemanticError as e:
+                    errors.append(str(e))
+                error_msg = "\n".join(errors)
+                raise SyntaxError(f"Se encontraron errores sintacticos:\n{error_msg}")
+            timings['sintactico'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if fused:
+                generator = SemanticCodeGenerator(SemanticAnalyzer(self.diagnostics))
+                analyzer = generator.analyzer
+                result.analyzer = analyzer
+                self.intermediate_code = generator.generate(self.ast)
+                self.symbol_table = analyzer.symbol_table
+            else:
+                analyzer = SemanticAnalyzer(self.diagnostics)
+                result.analyzer = analyzer
+                self.symbol_table = analyzer.analyze(self.ast)
+            result.symbol_table = self.symbol_table
+            timings['semantico'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if not fused:
+                generator = IntermediateCodeGenerator()
+                self.intermediate_code = generator.generate(self.ast)
+            result.generator = generator
+            self.operand_slots = generator.operand_slots
+            result.intermediate_code = self.intermediate_code
+            timings['intermedio'] = time.perf_counter() - start
+
+            if optimize:
+                start = time.perf_counter()
+                optimizer = ConstantFolder()
+                result.optimizer = optimizer
+                eliminator = DeadCodeEliminator()
+                result.eliminator = eliminator
+                self.intermediate_code = eliminator.optimize(optimizer.optimize(self.intermediate_code))
+                result.intermediate_code = self.intermediate_code
+                timings['optimizacion'] = time.perf_counter() - start
 
-            if verbose:
-                print("Analisis sintactico completado")
-                print("\n" + "="*80)
-                print("ARBOL DE SINTAXIS ABSTRACTA (AST)")
-                print("="*80 + "\n")
-                parser.print_ast(self.ast)
+        except LexicalError as e:
+            result.error, result.error_title = e, "ERROR LEXICO"
 
-            if verbose:
-                print("\nFASE 3: ANALISIS SEMANTICO")
-                print("-"*80)
+        except SyntaxError as e:
+            result.error, result.error_title = e, "ERROR SINTACTICO"
 
-            analyzer = SemanticAnalyzer()
-            self.symbol_table = analyzer.analyze(self.ast)
+        except SemanticError as e:
+            result.error, result.error_title = e, "ERROR SEMANTICO"
 
-            if verbose:
-                print("Analisis semantico completado")
-                analyzer.print_results()
-                self.symbol_table.print_table()
+        except Exception as e:
+            result.error, result.error_title = e, "ERROR INESPERADO"
 
-            if verbose:
-                print("\nFASE 4: GENERACION DE CODIGO INTERMEDIO")
-                print("-"*80)
+        return result
 
-            generator = IntermediateCodeGenerator()
-            self.intermediate_code = generator.generate(self.ast)
+    def compile_stream(self, source: Union[str, TextIO],
+                       sink: Callable[[ThreeAddressCode], None], verbose: bool = True,
+                       fused: bool = False):
+        self.source_code = source if isinstance(source, str) else ""
+        self.tokens = []
+        self.ast = None
+        self.intermediate_code = []
+        self.operand_slots = {}
 
-            if verbose:
-                print("Generacion de codigo intermedio completada")
-                generator.print_code()
+        try:
+            if isinstance(source, str):
+                lexer = Lexer(source)
+                tokens = lexer.iter_tokens()
+            else:
+                lexer = Lexer('')
+                tokens = lexer.iter_tokens(source)
+
+            parser = Parser(tokens, lexer.names, recover=True)
+            analyzer = SemanticAnalyzer(self.diagnostics)
+            analyzer.begin(lexer.names)
+            if fused:
+                generator = SemanticCodeGenerator(analyzer)
+            else:
+                generator = IntermediateCodeGenerator()
+            statement_count = 0
+            instruction_count = 0
+
+            for statement in parser.iter_statements():
+                statement_count += 1
+
+                if fused:
+                    code = generator.generate_statement(statement)
+                else:
+                    analyzer.analyze_statement(statement)
+
+                if parser.errors or analyzer.errors:
+                    continue
+
+                if not fused:
+                    code = generator.generate_statement(statement)
+
+                for instruction in code:
+                    sink(instruction)
+                    instruction_count += 1
+
+            if parser.errors:
+                errors = list(parser.errors)
+                try:
+                    analyzer.finish()
+                except SemanticError as e:
+                    errors.append(str(e))
+                error_msg = "\n".join(errors)
+                raise SyntaxError(f"Se encontraron errores sintacticos:\n{error_msg}")
+
+            self.symbol_table = analyzer.finish()
+            self.operand_slots = generator.operand_slots
 
             if verbose:
+                analyzer.print_results()
                 print("\n" + "="*80)
                 print("COMPILACION EXITOSA")
+                print("="*80)
+                print(f"Sentencias: {statement_count}")
+                print(f"Simbolos: {len(self.symbol_table.slots)}")
+                print(f"Instrucciones: {instruction_count}")
+                print(f"Advertencias: {self.diagnostics.warning_count}")
                 print("="*80 + "\n")
 
             return True
 
         except LexicalError as e:
-            print("\n" + "="*80)
-            print("ERROR LEXICO")
-            print("="*80)
-            print(f"\n{str(e)}\n")
-            print("="*80 + "\n")
-            return False
+            return self.report_error("ERROR LEXICO", e)
 
         except SyntaxError as e:
-            print("\n" + "="*80)
-            print("ERROR SINTACTICO")
-            print("="*80)
-            print(f"\n{str(e)}\n")
-            print("="*80 + "\n")
-            return False
+            return self.report_error("ERROR SINTACTICO", e)
 
         except SemanticError as e:
-            print("\n" + "="*80)
-            print("ERROR SEMANTICO")
-            print("="*80)
-            print(f"\n{str(e)}\n")
-            print("="*80 + "\n")
-            return False
+            return self.report_error("ERROR SEMANTICO", e)
 
         except Exception as e:
-            print("\n" + "="*80)
-            print("ERROR INESPERADO")
-            print("="*80)
-            print(f"\n{str(e)}\n")
-            print("="*80 + "\n")
-            return False
+            return self.report_error("ERROR INESPERADO", e)
+
+    def run(self, output: Optional[Callable[[Any], None]] = None) -> VirtualMachine:
+        return VirtualMachine(self.intermediate_code, self.operand_slots).run(output)
 
-    def compile_file(self, filepath: str, verbose: bool = True):
+    def run_native(self, output: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
+        return PythonBackend(self.intermediate_code, self.operand_slots).run(output)
+
+    def release_source(self, result: CompilationResult):
+        result.source = self.source_code = None
+        if result.lexer is not None:
+            result.lexer.source_code = None
+
+    def report_error(self, title: str, error: Exception) -> bool:
+        print_error(title, error)
+        return False
+
+    def compile_file(self, filepath: str, verbose: bool = True, use_mmap: bool = False,
+                     workers: int = 1, sink: Optional[Callable[[ThreeAddressCode], None]] = None,
+                     fused: bool = False, optimize: bool = False):
         try:
+            if sink is not None:
+                print(f"\nCompilando archivo: {filepath} (sentencia a sentencia)")
+                print("-"*80)
+
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    return self.compile_stream(f, sink, verbose, fused)
+
+            if use_mmap:
+                with Lexer.from_mapped_file(filepath) as mapped:
+                    source_code = mapped.source_code
+
+                    print(f"\nCompilando archivo: {filepath} ({len(source_code)} bytes, mapeado en memoria)")
+                    print("-"*80)
+
+                    result = self.compile(source_code, verbose, workers, fused, optimize)
+                    self.release_source(result)
+                    return result
+
             with open(filepath, 'r', encoding='utf-8') as f:
                 source_code = f.read()
 
@@ -119,7 +246,7 @@ class Compiler:
             print(source_code)
             print("-"*80)
 
-            return self.compile(source_code, verbose)
+            return self.compile(source_code, verbose, workers, fused, optimize)
 
         except FileNotFoundError:
             print(f"\nError: No se encontro el archivo '{filepath}'")
@@ -129,7 +256,7 @@ class Compiler:
             return False
 
 
-def main():
+def run_examples():
     compiler = Compiler()
 
     print("\n" + "="*80)
@@ -199,5 +326,105 @@ def main():
     compiler.compile(codigo_ejemplo4, verbose=True)
 
 
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compilador MiniLang")
+    arg_parser.add_argument('archivo', nargs='?',
+                            help="archivo .ml a compilar (sin archivo se ejecutan los ejemplos)")
+    arg_parser.add_argument('--mmap', action='store_true',
+                            help="mapear el archivo en memoria y analizarlo como bytes ASCII")
+    arg_parser.add_argument('--procesos', type=int, default=1, metavar='N',
+                            help="analisis lexico en paralelo con N procesos para archivos grandes")
+    arg_parser.add_argument('--flujo', action='store_true',
+                            help="compilar sentencia a sentencia e imprimir el codigo intermedio "
+                                 "a medida que se genera")
+    arg_parser.add_argument('--fusionado', action='store_true',
+                            help="analisis semantico y generacion de codigo en un solo recorrido del AST")
+    arg_parser.add_argument('--ignorar', action='append', default=[], metavar='CODIGO',
+                            help="no informar los diagnosticos con el codigo dado (p. ej. W002)")
+    arg_parser.add_argument('--max-advertencias', type=int, default=None, metavar='N',
+                            help="mostrar como maximo N advertencias y contar el resto")
+    arg_parser.add_argument('--contar-advertencias', action='store_true',
+                            help="solo contar las advertencias, sin construir sus mensajes")
+    arg_parser.add_argument('--optimizar', action='store_true',
+                            help="plegar constantes, simplificar identidades algebraicas y eliminar codigo muerto "
+                                 "en el codigo intermedio")
+    arg_parser.add_argument('--ejecutar', action='store_true',
+                            help="ejecutar el codigo intermedio generado en la maquina virtual")
+    arg_parser.add_argument('--nativo', action='store_true',
+                            help="con --ejecutar, traducir el codigo intermedio a Python y ejecutarlo compilado")
+    arg_parser.add_argument('--json', action='store_true',
+                            help="imprimir el resultado de la compilacion en formato JSON")
+    arg_parser.add_argument('-q', '--silencioso', action='store_true',
+                            help="no imprimir el detalle de cada fase")
+    args = arg_parser.parse_args()
+
+    if args.flujo and args.optimizar:
+        arg_parser.error("--optimizar necesita el programa completo y no se puede combinar con --flujo")
+    if args.json and args.flujo:
+        arg_parser.error("--json necesita el programa completo y no se puede combinar con --flujo")
+    if args.json and args.ejecutar:
+        arg_parser.error("--json solo informa la compilacion y no se puede combinar con --ejecutar")
+
+    if args.archivo is None:
+        run_examples()
+        return
+
+    compiler = Compiler(Diagnostics(args.ignorar, args.max_advertencias, args.contar_advertencias))
+    sink = None
+
+    if args.json:
+        try:
+            if args.mmap:
+                with Lexer.from_mapped_file(args.archivo) as mapped:
+                    result = compiler.compile_result(mapped.source_code, args.procesos, args.fusionado,
+                                                     args.optimizar)
+                    compiler.release_source(result)
+            else:
+                with open(args.archivo, 'r', encoding='utf-8') as f:
+                    source_code = f.read()
+                result = compiler.compile_result(source_code, args.procesos, args.fusionado, args.optimizar)
+        except OSError as e:
+            print(f"\nError al leer el archivo: {str(e)}")
+            sys.exit(1)
+
+        print(result.to_json(indent=2))
+        sys.exit(0 if result else 1)
+
+    if args.flujo:
+        counter = iter(range(sys.maxsize))
+
+        def sink(instruction: ThreeAddressCode):
+            print(f"{next(counter):<5} {instruction}")
+            if args.ejecutar:
+                compiler.intermediate_code.append(instruction)
+
+    success = compiler.compile_file(args.archivo, verbose=not args.silencioso, use_mmap=args.mmap,
+                                    workers=args.procesos, sink=sink, fused=args.fusionado,
+                                    optimize=args.optimizar)
+
+    if success and args.ejecutar:
+        if not args.silencioso:
+            print("="*80)
+            print("EJECUCION")
+            print("="*80)
+
+        try:
+            if args.nativo:
+                compiler.run_native()
+                summary = "Ejecucion nativa completada"
+            else:
+                summary = f"Instrucciones ejecutadas: {compiler.run().steps}"
+        except ExecutionError as e:
+            compiler.report_error("ERROR DE EJECUCION", e)
+            sys.exit(1)
+
+        if not args.silencioso:
+            print("="*80)
+            print(summary)
+            print("="*80 + "\n")
+
+    sys.exit(0 if success else 1)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class Severity(Enum):
+    ERROR = auto()
+    WARNING = auto()
+
+
+MESSAGES: Dict[str, Tuple[Severity, str]] = {
+    'E001': (Severity.ERROR, "Error semantico (linea {line}): Variable '{0}' no declarada."),
+    'E002': (Severity.ERROR, "Error semantico: Variable '{0}' ya declarada en linea {1}. "
+                             "Redeclaracion en linea {line}."),
+    'E003': (Severity.ERROR, "Error semantico (linea {line}): "
+                             "Operador '{0}' requiere operandos numericos."),
+    'E004': (Severity.ERROR, "Error semantico (linea {line}): "
+                             "Operador '{0}' requiere operandos comparables."),
+    'E005': (Severity.ERROR, "Error semantico (linea {line}): "
+                             "Operador unario '{0}' requiere operando numerico."),
+    'E006': (Severity.ERROR, "Error semantico (linea {line}): "
+                             "Literal numerico fuera del rango de los numeros reales."),
+    'W001': (Severity.WARNING, "Advertencia (linea {line}): Variable '{0}' podria no estar inicializada."),
+    'W002': (Severity.WARNING, "Advertencia: Variable '{0}' declarada en linea {line} pero nunca usada."),
+    'W003': (Severity.WARNING, "Advertencia: Variable '{0}' usada en el programa "
+                               "pero podria no estar inicializada (declarada en linea {line})."),
+}
+
+
+@dataclass(slots=True)
+class Diagnostic:
+    code: str
+    severity: Severity
+    line: int = 0
+    column: int = 0
+    args: Tuple = ()
+
+    @property
+    def message(self) -> str:
+        return MESSAGES[self.code][1].format(*self.args, line=self.line, column=self.column)
+
+    def __str__(self):
+        return self.message
+
+
+class DiagnosticError(Exception):
+    def __init__(self, diagnostic: Diagnostic):
+        super().__init__(diagnostic)
+        self.diagnostic = diagnostic
+
+
+class Diagnostics:
+    def __init__(self, ignore: Iterable[str] = (), max_warnings: Optional[int] = None,
+                 count_only: bool = False):
+        self.ignore = frozenset(ignore)
+        self.max_warnings = max_warnings
+        self.count_only = count_only
+        self.clear()
+
+    def clear(self):
+        self.errors: List[Diagnostic] = []
+        self.warnings: List[Diagnostic] = []
+        self.error_count = 0
+        self.warning_count = 0
+        self.suppressed = 0
+
+    def keeps_warnings(self) -> bool:
+        if self.count_only:
+            return False
+        return self.max_warnings is None or len(self.warnings) < self.max_warnings
+
+    def report(self, code: str, line: int, *args, column: int = 0):
+        if code in self.ignore:
+            self.suppressed += 1
+            return
+
+        severity = MESSAGES[code][0]
+        if severity is Severity.ERROR:
+            self.error_count += 1
+            self.errors.append(Diagnostic(code, severity, line, column, args))
+        else:
+            self.warning_count += 1
+            if self.keeps_warnings():
+                self.warnings.append(Diagnostic(code, severity, line, column, args))
+
+    def add(self, diagnostic: Diagnostic):
+        if diagnostic.code in self.ignore:
+            self.suppressed += 1
+        elif diagnostic.severity is Severity.ERROR:
+            self.error_count += 1
+            self.errors.append(diagnostic)
+        else:
+            self.warning_count += 1
+            if self.keeps_warnings():
+                self.warnings.append(diagnostic)
+
+    @property
+    def omitted(self) -> int:
+        return self.warning_count - len(self.warnings)
+
+    def filter(self, severity: Optional[Severity] = None,
+               codes: Optional[Iterable[str]] = None) -> Iterator[Diagnostic]:
+        codes = frozenset(codes) if codes is not None else None
+
+        for diagnostic in self.errors + self.warnings:
+            if severity is not None and diagnostic.severity is not severity:
+                continue
+            if codes is not None and diagnostic.code not in codes:
+                continue
+            yield diagnostic
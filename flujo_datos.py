@@ -0,0 +1,210 @@
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+from sintactico import (
+    ASTNode, ProgramNode, VarDeclarationNode, AssignmentNode,
+    BinaryOpNode, UnaryOpNode, IdentifierNode, IfNode, WhileNode, PrintNode
+)
+from recorrido import NodeVisitor
+
+
+def solve_dataflow(predecessors: List[List[int]], successors: List[List[int]],
+                   gen: List[int], kill: List[int], boundary: int = 0,
+                   forward: bool = True, must: bool = False) -> Tuple[List[int], List[int]]:
+    count = len(gen)
+    if not forward:
+        predecessors, successors = successors, predecessors
+
+    initial = -1 if must else 0
+    facts_in = [boundary] * count
+    facts_out = [initial] * count
+    queued = [True] * count
+    worklist = deque(range(count) if forward else reversed(range(count)))
+
+    while worklist:
+        block = worklist.popleft()
+        queued[block] = False
+
+        sources = predecessors[block]
+        if not sources:
+            value = boundary
+        elif must:
+            value = -1
+            for source in sources:
+                value &= facts_out[source]
+        else:
+            value = 0
+            for source in sources:
+                value |= facts_out[source]
+
+        facts_in[block] = value
+        result = gen[block] | (value & ~kill[block])
+
+        if result != facts_out[block]:
+            facts_out[block] = result
+            for target in successors[block]:
+                if not queued[target]:
+                    queued[target] = True
+                    worklist.append(target)
+
+    if forward:
+        return facts_in, facts_out
+    return facts_out, facts_in
+
+
+def iter_identifiers(expression: ASTNode) -> Iterator[IdentifierNode]:
+    stack = [expression]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, IdentifierNode):
+            yield node
+        elif isinstance(node, BinaryOpNode):
+            stack.append(node.right)
+            stack.append(node.left)
+        elif isinstance(node, UnaryOpNode):
+            stack.append(node.operand)
+
+
+class StatementGraph(NodeVisitor):
+    def __init__(self, statement: ASTNode):
+        self.items: List[List[ASTNode]] = []
+        self.predecessors: List[List[int]] = []
+        self.successors: List[List[int]] = []
+        self.current = self.new_block()
+        self.visit(statement)
+        self.exit = self.current
+
+    def new_block(self) -> int:
+        self.items.append([])
+        self.predecessors.append([])
+        self.successors.append([])
+        return len(self.items) - 1
+
+    def edge(self, source: int, target: int):
+        self.successors[source].append(target)
+        self.predecessors[target].append(source)
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        for statement in node.statements:
+            yield statement
+
+    def visit_VarDeclarationNode(self, node: VarDeclarationNode):
+        self.items[self.current].append(node)
+
+    def visit_AssignmentNode(self, node: AssignmentNode):
+        self.items[self.current].append(node)
+
+    def visit_PrintNode(self, node: PrintNode):
+        self.items[self.current].append(node)
+
+    def visit_IfNode(self, node: IfNode):
+        condition = self.current
+        self.items[condition].append(node.condition)
+
+        self.current = self.new_block()
+        self.edge(condition, self.current)
+        for statement in node.then_block:
+            yield statement
+        then_end = self.current
+
+        else_end = condition
+        if node.else_block:
+            self.current = self.new_block()
+            self.edge(condition, self.current)
+            for statement in node.else_block:
+                yield statement
+            else_end = self.current
+
+        self.current = self.new_block()
+        self.edge(then_end, self.current)
+        self.edge(else_end, self.current)
+
+    def visit_WhileNode(self, node: WhileNode):
+        header = self.new_block()
+        self.edge(self.current, header)
+        self.items[header].append(node.condition)
+
+        self.current = self.new_block()
+        self.edge(header, self.current)
+        for statement in node.body:
+            yield statement
+        self.edge(self.current, header)
+
+        self.current = self.new_block()
+        self.edge(header, self.current)
+
+
+class DefiniteAssignment:
+    def __init__(self):
+        self.assigned = bytearray()
+
+    def analyze(self, node: ASTNode) -> List[IdentifierNode]:
+        if isinstance(node, ProgramNode):
+            unassigned = []
+            for statement in node.statements:
+                unassigned.extend(self.analyze_statement(statement))
+            return unassigned
+        return self.analyze_statement(node)
+
+    def analyze_statement(self, statement: ASTNode) -> List[IdentifierNode]:
+        graph = StatementGraph(statement)
+        local: Dict[int, int] = {}
+        gen = []
+        kill = []
+
+        for items in graph.items:
+            block_gen = 0
+            block_kill = 0
+            for item in items:
+                if isinstance(item, (AssignmentNode, VarDeclarationNode)) and item.slot >= 0:
+                    bit = 1 << local.setdefault(item.slot, len(local))
+                    if isinstance(item, AssignmentNode):
+                        block_gen |= bit
+                        block_kill &= ~bit
+                    else:
+                        block_gen &= ~bit
+                        block_kill |= bit
+            gen.append(block_gen)
+            kill.append(block_kill)
+
+        state = self.assigned
+        if local and max(local) >= len(state):
+            state.extend(bytes(max(local) + 1 - len(state)))
+
+        boundary = 0
+        for slot, index in local.items():
+            if state[slot]:
+                boundary |= 1 << index
+
+        facts_in, facts_out = solve_dataflow(graph.predecessors, graph.successors, gen, kill,
+                                             boundary, forward=True, must=True)
+
+        unassigned = []
+        for block, items in enumerate(graph.items):
+            assigned = facts_in[block]
+            for item in items:
+                if isinstance(item, VarDeclarationNode):
+                    if item.slot >= 0:
+                        assigned &= ~(1 << local[item.slot])
+                    continue
+
+                expression = item.expression if isinstance(item, (AssignmentNode, PrintNode)) else item
+                for identifier in iter_identifiers(expression):
+                    slot = identifier.slot
+                    if slot < 0:
+                        continue
+                    index = local.get(slot)
+                    if index is None:
+                        if slot >= len(state) or not state[slot]:
+                            unassigned.append(identifier)
+                    elif not (assigned >> index) & 1:
+                        unassigned.append(identifier)
+
+                if isinstance(item, AssignmentNode) and item.slot >= 0:
+                    assigned |= 1 << local[item.slot]
+
+        exit_facts = facts_out[graph.exit]
+        for slot, index in local.items():
+            state[slot] = (exit_facts >> index) & 1
+
+        return unassigned
@@ -0,0 +1,278 @@
+from typing import Any, Callable, Dict, List, Optional, Set
+from codigo_intermedio import TEMP_NAME, ThreeAddressCode
+from maquina_virtual import ExecutionError, divide, parse_constant, resolve_labels
+
+
+BINARY_OPERATORS = {'+', '-', '*', '==', '!=', '<', '>', '<=', '>='}
+COMPARISONS = {'==', '!=', '<', '>', '<=', '>='}
+MAX_NESTING = 18
+
+
+class Unstructured(Exception):
+    pass
+
+
+class PythonBackend:
+    def __init__(self, code: List[ThreeAddressCode], operand_slots: Optional[Dict[str, int]] = None):
+        self.code = code
+        self.operand_slots = operand_slots
+        self.labels = resolve_labels(code)
+        self.label_index = {
+            instruction.result: index for index, instruction in enumerate(code) if instruction.op == 'LABEL'
+        }
+        self.jump_targets = {
+            instruction.result for instruction in code if instruction.op in ('GOTO', 'IF_FALSE', 'IF_TRUE')
+        }
+        self.uses: Dict[str, int] = {}
+        self.variables: Dict[str, str] = {}
+        self.temporaries: Set[str] = set()
+        self.lines: List[str] = []
+        self.structured = True
+
+        for instruction in code:
+            for operand in (instruction.arg1, instruction.arg2):
+                if operand is not None:
+                    self.uses[operand] = self.uses.get(operand, 0) + 1
+
+        try:
+            self.structure(0, len(code), 1)
+        except Unstructured:
+            self.structured = False
+            self.lines = []
+            self.dispatch_loop()
+
+        self.source = self.render()
+        self.code_object = None
+        self.function: Optional[Callable] = None
+
+    def is_variable(self, operand: str) -> bool:
+        if self.operand_slots is not None:
+            return operand in self.operand_slots
+        return not TEMP_NAME.match(operand)
+
+    def name(self, operand: str) -> str:
+        constant = parse_constant(operand)
+        if constant is not None:
+            return operand
+
+        if self.is_variable(operand):
+            name = self.variables.get(operand)
+            if name is None:
+                base, _, suffix = operand.partition('.')
+                name = f"v{suffix}_{base}"
+                self.variables[operand] = name
+            return name
+
+        self.temporaries.add(operand)
+        return '_' + operand
+
+    def expression(self, instruction: ThreeAddressCode) -> str:
+        op = instruction.op
+        if op == 'ASSIGN':
+            return self.name(instruction.arg1)
+        if op == '/':
+            return f"divide({self.name(instruction.arg1)}, {self.name(instruction.arg2)})"
+        if op in BINARY_OPERATORS:
+            return f"{self.name(instruction.arg1)} {op} {self.name(instruction.arg2)}"
+        if op == 'UNARY_MINUS':
+            return f"-{self.name(instruction.arg1)}"
+        if op == 'UNARY_PLUS':
+            return f"+{self.name(instruction.arg1)}"
+        raise ExecutionError(f"Instruccion desconocida: {instruction}")
+
+    def fusable(self, index: int, low: int) -> bool:
+        if index < low or index + 1 >= len(self.code):
+            return False
+        instruction = self.code[index]
+        branch = self.code[index + 1]
+        return (instruction.op in COMPARISONS and branch.op == 'IF_FALSE'
+                and branch.arg1 == instruction.result and self.uses.get(instruction.result) == 1)
+
+    def condition(self, index: int, low: int) -> str:
+        if self.fusable(index - 1, low):
+            return self.expression(self.code[index - 1])
+        return self.name(self.code[index].arg1)
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def straight(self, instruction: ThreeAddressCode, indent: int):
+        if instruction.op == 'PRINT':
+            self.emit(indent, f"output({self.name(instruction.arg1)})")
+        else:
+            self.emit(indent, f"{self.name(instruction.result)} = {self.expression(instruction)}")
+
+    def structure(self, low: int, high: int, indent: int):
+        if indent > MAX_NESTING:
+            raise Unstructured()
+
+        code = self.code
+        start = len(self.lines)
+        index = low
+
+        while index < high:
+            instruction = code[index]
+            op = instruction.op
+
+            if op == 'LABEL':
+                end = self.loop_end(index, high)
+                if end is None:
+                    if instruction.result in self.jump_targets:
+                        raise Unstructured()
+                    index += 1
+                    continue
+
+                branch = self.loop_branch(index, end)
+                condition = self.condition(branch, index + 1)
+                header_end = branch - 1 if self.fusable(branch - 1, index + 1) else branch
+
+                if header_end == index + 1:
+                    self.emit(indent, f"while {condition}:")
+                else:
+                    self.emit(indent, "while True:")
+                    for position in range(index + 1, header_end):
+                        self.check_straight(position)
+                        self.straight(code[position], indent + 1)
+                    self.emit(indent + 1, f"if not ({condition}):")
+                    self.emit(indent + 2, "break")
+
+                body_start = len(self.lines)
+                self.structure(branch + 1, end - 1, indent + 1)
+                if len(self.lines) == body_start:
+                    self.emit(indent + 1, "pass")
+                index = end + 1
+
+            elif op == 'IF_FALSE':
+                else_label = self.label_index.get(instruction.result)
+                if else_label is None or not index < else_label < high:
+                    raise Unstructured()
+
+                jump = code[else_label - 1]
+                if else_label - 1 > index and jump.op == 'GOTO':
+                    end_label = self.label_index.get(jump.result)
+                    if end_label is None or not else_label < end_label < high:
+                        raise Unstructured()
+                    then_end = else_label - 1
+                else:
+                    end_label = else_label
+                    then_end = else_label
+
+                self.emit(indent, f"if {self.condition(index, low)}:")
+                body_start = len(self.lines)
+                self.structure(index + 1, then_end, indent + 1)
+                if len(self.lines) == body_start:
+                    self.emit(indent + 1, "pass")
+
+                if end_label > else_label + 1:
+                    self.emit(indent, "else:")
+                    self.structure(else_label + 1, end_label, indent + 1)
+
+                index = end_label + 1
+
+            elif op in ('GOTO', 'IF_TRUE'):
+                raise Unstructured()
+
+            else:
+                if not self.fusable(index, low):
+                    self.straight(instruction, indent)
+                index += 1
+
+        if indent == 1 and len(self.lines) == start:
+            self.emit(indent, "pass")
+
+    def check_straight(self, position: int):
+        if self.code[position].op in ('LABEL', 'GOTO', 'IF_FALSE', 'IF_TRUE'):
+            raise Unstructured()
+
+    def loop_end(self, index: int, high: int) -> Optional[int]:
+        label = self.code[index].result
+        for position in range(index + 1, high):
+            instruction = self.code[position]
+            if instruction.op == 'IF_FALSE':
+                end = self.label_index.get(instruction.result)
+                if (end is not None and position < end < high
+                        and self.code[end - 1].op == 'GOTO' and self.code[end - 1].result == label):
+                    return end
+                return None
+            if instruction.op in ('LABEL', 'GOTO', 'IF_TRUE'):
+                return None
+        return None
+
+    def loop_branch(self, index: int, end: int) -> int:
+        for position in range(index + 1, end):
+            if self.code[position].op == 'IF_FALSE':
+                return position
+        raise Unstructured()
+
+    def dispatch_loop(self):
+        code = self.code
+        labels = self.labels
+        leaders = {0}
+        program = [instruction for instruction in code if instruction.op != 'LABEL']
+
+        for position, instruction in enumerate(program):
+            if instruction.op in ('GOTO', 'IF_FALSE', 'IF_TRUE'):
+                leaders.add(labels[instruction.result])
+                leaders.add(position + 1)
+
+        leaders = sorted(leader for leader in leaders if leader < len(program))
+        self.emit(1, "pc = 0")
+        self.emit(1, "while True:")
+
+        for number, leader in enumerate(leaders):
+            end = leaders[number + 1] if number + 1 < len(leaders) else len(program)
+            self.emit(2, f"if pc == {leader}:")
+            falls_through = True
+
+            for position in range(leader, end):
+                instruction = program[position]
+                op = instruction.op
+                if op == 'GOTO':
+                    self.emit(3, f"pc = {labels[instruction.result]}")
+                    self.emit(3, "continue")
+                    falls_through = False
+                elif op in ('IF_FALSE', 'IF_TRUE'):
+                    test = "not " if op == 'IF_FALSE' else ""
+                    self.emit(3, f"if {test}{self.name(instruction.arg1)}:")
+                    self.emit(4, f"pc = {labels[instruction.result]}")
+                    self.emit(4, "continue")
+                else:
+                    self.straight(instruction, 3)
+
+            if falls_through:
+                self.emit(3, f"pc = {end}")
+
+        self.emit(2, "break")
+
+    def render(self) -> str:
+        header = ["def programa(output, divide):"]
+        names = sorted(self.variables.values()) + sorted('_' + temp for temp in self.temporaries)
+        for position in range(0, len(names), 16):
+            header.append("    " + " = ".join(names[position:position + 16]) + " = 0")
+
+        values = ", ".join(f"{operand!r}: {name}" for operand, name in self.variables.items())
+        return "\n".join(header + self.lines + [f"    return {{{values}}}", ""])
+
+    def compile(self) -> Callable:
+        if self.function is None:
+            try:
+                self.code_object = compile(self.source, "<minilang>", "exec")
+            except (SyntaxError, RecursionError, MemoryError):
+                if not self.structured:
+                    raise
+                self.structured = False
+                self.lines = []
+                self.dispatch_loop()
+                self.source = self.render()
+                self.code_object = compile(self.source, "<minilang>", "exec")
+            namespace: Dict[str, Any] = {}
+            exec(self.code_object, namespace)
+            self.function = namespace['programa']
+        return self.function
+
+    def run(self, output: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
+        function = self.compile()
+        try:
+            return function(output if output is not None else print, divide)
+        except ExecutionError as e:
+            raise ExecutionError(f"Error de ejecucion: {str(e)}")
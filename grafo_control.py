@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional, Sequence
+from codigo_intermedio import ThreeAddressCode
+
+
+JUMPS = ('GOTO', 'IF_FALSE', 'IF_TRUE')
+BRANCHES = ('IF_FALSE', 'IF_TRUE')
+
+
+class ControlFlowGraph:
+    def __init__(self, code: List[ThreeAddressCode]):
+        self.code = code
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.labels: List[Optional[str]] = []
+        self.label_blocks: Dict[str, int] = {}
+        self.predecessors: List[List[int]] = []
+        self.successors: List[List[int]] = []
+        self.order: List[int] = []
+        self.idom: List[int] = []
+        self.build()
+        self.compute_dominators()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def build(self):
+        code = self.code
+        starts = self.starts
+        labels = self.labels
+        leader = True
+
+        for index, instruction in enumerate(code):
+            op = instruction.op
+            if op == 'LABEL':
+                if leader or code[index - 1].op != 'LABEL':
+                    starts.append(index)
+                    labels.append(instruction.result)
+                self.label_blocks[instruction.result] = len(starts) - 1
+                leader = False
+            elif leader:
+                starts.append(index)
+                labels.append(None)
+                leader = False
+            if op in JUMPS:
+                leader = True
+
+        count = len(starts)
+        self.ends = starts[1:] + [len(code)]
+        self.predecessors = [[] for _ in range(count)]
+        self.successors = [[] for _ in range(count)]
+
+        for block in range(count):
+            last = code[self.ends[block] - 1]
+            if last.op in JUMPS:
+                target = self.label_blocks.get(last.result)
+                if target is None:
+                    raise ValueError(f"Etiqueta no definida: {last.result}")
+                if last.op in BRANCHES and block + 1 < count:
+                    self.edge(block, block + 1)
+                if target not in self.successors[block]:
+                    self.edge(block, target)
+            elif block + 1 < count:
+                self.edge(block, block + 1)
+
+    def edge(self, source: int, target: int):
+        self.successors[source].append(target)
+        self.predecessors[target].append(source)
+
+    def instructions(self, block: int) -> List[ThreeAddressCode]:
+        return self.code[self.starts[block]:self.ends[block]]
+
+    def falls_through(self, block: int) -> bool:
+        return self.code[self.ends[block] - 1].op != 'GOTO'
+
+    def reverse_postorder(self) -> List[int]:
+        count = len(self.starts)
+        if not count:
+            return []
+
+        visited = [False] * count
+        postorder: List[int] = []
+        visited[0] = True
+        stack = [(0, iter(self.successors[0]))]
+
+        while stack:
+            block, pending = stack[-1]
+            for target in pending:
+                if not visited[target]:
+                    visited[target] = True
+                    stack.append((target, iter(self.successors[target])))
+                    break
+            else:
+                stack.pop()
+                postorder.append(block)
+
+        postorder.reverse()
+        return postorder
+
+    def compute_dominators(self):
+        count = len(self.starts)
+        self.order = self.reverse_postorder()
+        position = [-1] * count
+        for number, block in enumerate(self.order):
+            position[block] = number
+
+        idom = [-1] * count
+        if count:
+            idom[0] = 0
+
+        changed = True
+        while changed:
+            changed = False
+            for block in self.order[1:]:
+                new = -1
+                for source in self.predecessors[block]:
+                    if idom[source] == -1:
+                        continue
+                    if new == -1:
+                        new = source
+                        continue
+                    first, second = source, new
+                    while first != second:
+                        while position[first] > position[second]:
+                            first = idom[first]
+                        while position[second] > position[first]:
+                            second = idom[second]
+                    new = first
+                if idom[block] != new:
+                    idom[block] = new
+                    changed = True
+
+        self.idom = idom
+
+    def reachable(self, block: int) -> bool:
+        return self.idom[block] != -1
+
+    def dominates(self, dominator: int, block: int) -> bool:
+        if self.idom[block] == -1:
+            return False
+        while block != dominator:
+            parent = self.idom[block]
+            if parent == block:
+                return False
+            block = parent
+        return True
+
+    def dominators(self, block: int) -> List[int]:
+        if self.idom[block] == -1:
+            return []
+        chain = [block]
+        while self.idom[block] != block:
+            block = self.idom[block]
+            chain.append(block)
+        return chain
+
+    def label(self, block: int) -> str:
+        if block < len(self.starts) and self.labels[block] is not None:
+            return self.labels[block]
+        return f"B{block}"
+
+    def linearize(self, order: Optional[Sequence[int]] = None,
+                  bodies: Optional[Sequence[List[ThreeAddressCode]]] = None) -> List[ThreeAddressCode]:
+        count = len(self.starts)
+        order = list(range(count) if order is None else order)
+        labels: Dict[int, str] = {block: label for block, label in enumerate(self.labels) if label is not None}
+        jumps: Dict[int, str] = {}
+        for number, block in enumerate(order):
+            following = order[number + 1] if number + 1 < len(order) else count
+            if self.falls_through(block) and following != block + 1:
+                jumps[block] = labels.setdefault(block + 1, self.label(block + 1))
+
+        code: List[ThreeAddressCode] = []
+        for block in order:
+            body = bodies[block] if bodies is not None else self.instructions(block)
+            label = labels.get(block)
+            if label is not None and (not body or body[0].op != 'LABEL'):
+                code.append(ThreeAddressCode('LABEL', None, None, label))
+            code.extend(body)
+            if block in jumps:
+                code.append(ThreeAddressCode('GOTO', None, None, jumps[block]))
+
+        if count - 1 in jumps:
+            code.append(ThreeAddressCode('LABEL', None, None, labels[count]))
+        return code
@@ -271,65 +271,42 @@ class CompilerGUI:
         self.update_status("Compilando...", "#ff8800")
         self.root.update()
 
-        import io
-        from contextlib import redirect_stdout
-
         self.compiler = Compiler()
+        result = self.compiler.compile_result(code)
+        timings = result.timings
+
+        if 'lexico' in timings:
+            self.tokens_text.insert("1.0", result.render(result.write_tokens))
+
+        if 'sintactico' in timings:
+            header = "ARBOL DE SINTAXIS ABSTRACTA (AST)\n" + "="*80 + "\n"
+            self.ast_text.insert("1.0", header + result.render(result.write_ast))
 
-        try:
-            f = io.StringIO()
-            with redirect_stdout(f):
-                from lexico import Lexer
-                lexer = Lexer(code)
-                tokens = lexer.tokenize()
-                lexer.print_tokens()
-            self.tokens_text.insert("1.0", f.getvalue())
-
-            f = io.StringIO()
-            with redirect_stdout(f):
-                from sintactico import Parser
-                parser = Parser(tokens)
-                ast = parser.parse()
-                print("ARBOL DE SINTAXIS ABSTRACTA (AST)")
-                print("="*80)
-                parser.print_ast(ast)
-            self.ast_text.insert("1.0", f.getvalue())
-
-            f = io.StringIO()
-            with redirect_stdout(f):
-                from semantico import SemanticAnalyzer
-                analyzer = SemanticAnalyzer()
-                symbol_table = analyzer.analyze(ast)
-                analyzer.print_results()
-                symbol_table.print_table()
-            self.symbols_text.insert("1.0", f.getvalue())
-
-            f = io.StringIO()
-            with redirect_stdout(f):
-                from codigo_intermedio import IntermediateCodeGenerator
-                generator = IntermediateCodeGenerator()
-                intermediate_code = generator.generate(ast)
-                generator.print_code()
-            self.intermediate_text.insert("1.0", f.getvalue())
+        if 'semantico' in timings:
+            self.symbols_text.insert("1.0", result.render(result.write_semantic))
 
+        if 'intermedio' in timings:
+            self.intermediate_text.insert("1.0", result.render(result.write_code))
+
+        if result:
             self.console_text.insert("1.0", "COMPILACION EXITOSA\n\n")
             self.console_text.insert(tk.END, "Todas las fases completadas correctamente.\n")
-            self.console_text.insert(tk.END, f"Total de tokens: {len(tokens)-1}\n")
-            self.console_text.insert(tk.END, f"Total de simbolos: {len(symbol_table.get_all_symbols())}\n")
-            self.console_text.insert(tk.END, f"Total de instrucciones: {len(intermediate_code)}\n")
+            self.console_text.insert(tk.END, f"Total de tokens: {result.token_count}\n")
+            self.console_text.insert(tk.END, f"Total de simbolos: {len(result.symbol_table.slots)}\n")
+            self.console_text.insert(tk.END, f"Total de instrucciones: {len(result.intermediate_code)}\n")
 
             self.update_status("Compilacion exitosa", "#4ec9b0")
             messagebox.showinfo("Exito", "Compilacion completada exitosamente")
 
-        except (LexicalError, SyntaxError, SemanticError) as e:
-            self.console_text.insert("1.0", f"ERROR DE COMPILACION\n\n{str(e)}\n")
+        elif isinstance(result.error, (LexicalError, SyntaxError, SemanticError)):
+            self.console_text.insert("1.0", f"ERROR DE COMPILACION\n\n{str(result.error)}\n")
             self.update_status("Error de compilacion", "#f48771")
-            messagebox.showerror("Error de Compilacion", str(e))
+            messagebox.showerror("Error de Compilacion", str(result.error))
 
-        except Exception as e:
-            self.console_text.insert("1.0", f"ERROR INESPERADO\n\n{str(e)}\n")
+        else:
+            self.console_text.insert("1.0", f"ERROR INESPERADO\n\n{str(result.error)}\n")
             self.update_status("Error inesperado", "#f48771")
-            messagebox.showerror("Error", f"Error inesperado:\n{str(e)}")
+            messagebox.showerror("Error", f"Error inesperado:\n{str(result.error)}")
 
     def clear_results(self):
         self.tokens_text.delete("1.0", tk.END)
@@ -0,0 +1,152 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterator, List, Optional, Tuple
+from lexico import Token, TokenType, Lexer, NameTable
+from sintactico import ASTNode, ProgramNode, Parser
+
+
+@dataclass
+class TextEdit:
+    start_line: int
+    start_column: int
+    end_line: int
+    end_column: int
+    text: str
+
+
+def split_lines(text: str) -> List[str]:
+    lines = text.split('\n')
+    last = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def shift_lines(nodes: List[ASTNode], delta: int):
+    stack = list(nodes)
+
+    while stack:
+        node = stack.pop()
+        node.line += delta
+
+        for name in node.__slots__:
+            value = getattr(node, name)
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(value)
+
+
+class IncrementalParser:
+    def __init__(self, source: str, names: Optional[NameTable] = None):
+        self.names = names if names is not None else NameTable()
+        self.lexer = Lexer('', names=self.names)
+        self.lines: List[str] = split_lines(source)
+        self.starts: List[Tuple[int, int]] = []
+        self.program: Optional[ProgramNode] = None
+        self.reparsed = 0
+        self.parse()
+
+    @property
+    def source(self) -> str:
+        return ''.join(self.lines)
+
+    def parse(self) -> ProgramNode:
+        self.program = ProgramNode([], self.names)
+        self.starts = []
+        return self.reparse(1, len(self.lines), 0)
+
+    def edit(self, edit: TextEdit) -> ProgramNode:
+        lines = self.lines
+        first = edit.start_line - 1
+        last = edit.end_line - 1
+        head = lines[first][:edit.start_column - 1] if first < len(lines) else ''
+        tail = lines[last][edit.end_column - 1:] if last < len(lines) else ''
+        new_lines = split_lines(head + edit.text + tail)
+
+        if first > 0 and not lines[first - 1].endswith('\n'):
+            first -= 1
+            new_lines = split_lines(lines[first] + ''.join(new_lines))
+
+        while new_lines and not new_lines[-1].endswith('\n') and last + 1 < len(lines):
+            last += 1
+            new_lines[-1] += lines[last]
+
+        delta = len(new_lines) - len(lines[first:last + 1])
+        lines[first:last + 1] = new_lines
+
+        if self.program is None:
+            return self.parse()
+        return self.reparse(first + 1, last + 1, delta)
+
+    def reparse(self, first_line: int, last_line: int, delta: int) -> ProgramNode:
+        """Re-parse the top-level statements touched by lines first_line..last_line.
+
+        Reuse is per top-level statement only: an edit inside an if or while
+        body re-parses the whole enclosing statement, nested blocks included.
+        """
+        statements = self.program.statements
+        starts = self.starts
+
+        index = bisect_left(starts, (first_line, 0)) - 1
+        while index > 0 and self.lines[starts[index][0] - 1][:starts[index][1] - 1].strip():
+            index -= 1
+
+        if index > 0:
+            line = starts[index][0]
+        else:
+            index = 0
+            line = 1
+
+        resync = bisect_left(starts, (last_line + 1, 0))
+        new_statements: List[ASTNode] = []
+        new_starts: List[Tuple[int, int]] = []
+
+        try:
+            parser = Parser(self.tokens_from(line, last_line + delta), self.names)
+            parsed = parser.iter_statements()
+            while parser.current_type not in (None, TokenType.EOF):
+                position = (parser.current_line, parser.current_column)
+
+                while resync < len(starts) and (starts[resync][0] + delta, starts[resync][1]) < position:
+                    resync += 1
+                if resync < len(starts) and (starts[resync][0] + delta, starts[resync][1]) == position:
+                    break
+
+                new_starts.append(position)
+                new_statements.append(next(parsed))
+            else:
+                resync = len(starts)
+        except Exception:
+            self.program = None
+            self.starts = []
+            raise
+
+        if delta:
+            shift_lines(statements[resync:], delta)
+            starts[resync:] = [(line + delta, column) for line, column in starts[resync:]]
+
+        self.reparsed = len(new_statements)
+        statements[index:resync] = new_statements
+        starts[index:resync] = new_starts
+        return self.program
+
+    def tokens_from(self, line: int, last_line: int) -> Iterator[Token]:
+        lexer = self.lexer
+        lexer.line = line
+        lexer.column = 1
+
+        edited: List[Token] = []
+        for index in range(line - 1, min(last_line, len(self.lines))):
+            edited.extend(lexer.scan(self.lines[index], index + 1))
+        return chain(edited, self.scan_lines(max(last_line, line - 1)))
+
+    def scan_lines(self, start: int) -> Iterator[Token]:
+        lexer = self.lexer
+
+        for index in range(start, len(self.lines)):
+            yield from lexer.scan(self.lines[index], index + 1)
+
+        yield Token(TokenType.EOF, None, lexer.line, lexer.column)
@@ -1,7 +1,17 @@
+import mmap
+import os
 import re
+from array import array
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import List, Optional
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TokenType(Enum):
@@ -38,15 +48,137 @@ class Token:
     value: any
     line: int
     column: int
+    name_id: Optional[int] = None
 
     def __repr__(self):
         return f"Token({self.type.name}, {self.value!r}, {self.line}:{self.column})"
 
 
+TOKEN_TYPES = (None,) + tuple(TokenType)
+
+
+class NameTable:
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def name(self, name_id: int) -> str:
+        return self.names[name_id]
+
+
+class LineIndex:
+    def __init__(self, source: Union[str, bytes], first_line: int = 1):
+        newline = '\n' if isinstance(source, str) else b'\n'
+        self.first_line = first_line
+        self.starts = array('I', [0])
+        self.starts.extend(match.end() for match in re.finditer(re.escape(newline), source))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line(self, offset: int) -> int:
+        return bisect_right(self.starts, offset) + self.first_line - 1
+
+    def column(self, offset: int) -> int:
+        return offset - self.starts[bisect_right(self.starts, offset) - 1] + 1
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        index = bisect_right(self.starts, offset)
+        return index + self.first_line - 1, offset - self.starts[index - 1] + 1
+
+
+class TokenBuffer:
+    def __init__(self, line_index: Optional[LineIndex] = None, names: Optional[NameTable] = None):
+        self.types = array('B')
+        self.starts = array('I')
+        self.lengths = array('I')
+        self.value_ids = array('I')
+        self.values: list = [None]
+        self.name_ids: List[Optional[int]] = [None]
+        self.interned: dict = {}
+        self.line_index = line_index
+        self.names = names if names is not None else NameTable()
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self.token(index)
+
+    def intern(self, key: Union[str, bytes], token_type: TokenType, value) -> Tuple[int, int]:
+        if token_type == TokenType.IDENTIFIER:
+            name_id = self.names.intern(value)
+            value = self.names.names[name_id]
+        else:
+            name_id = None
+
+        entry = self.interned[key] = (token_type.value, len(self.values))
+        self.values.append(value)
+        self.name_ids.append(name_id)
+        return entry
+
+    def line(self, index: int) -> int:
+        return self.line_index.line(self.starts[index])
+
+    def column(self, index: int) -> int:
+        return self.line_index.column(self.starts[index])
+
+    def token(self, index: int) -> Token:
+        line, column = self.line_index.position(self.starts[index])
+        value_id = self.value_ids[index]
+        return Token(TOKEN_TYPES[self.types[index]], self.values[value_id], line, column,
+                     self.name_ids[value_id])
+
+
 class LexicalError(Exception):
     pass
 
 
+TOKEN_REGEX = re.compile(
+    r'(?P<SKIP>[ \t\r]+|//[^\n]*)'
+    r'|(?P<NEWLINE>\n[ \t\r\n]*)'
+    r'|(?P<NUMBER>\d[\d.]*)'
+    r'|(?P<IDENTIFIER>[^\W\d]\w*)'
+    r'|(?P<OPERATOR>==|!=|<=|>=|[-+*/=;(){}<>])'
+    r'|(?P<MISMATCH>.)'
+)
+
+BYTES_TOKEN_REGEX = re.compile(
+    rb'(?P<SKIP>[ \t\r]+|//[^\n]*)'
+    rb'|(?P<NEWLINE>\n[ \t\r\n]*)'
+    rb'|(?P<NUMBER>[0-9][0-9.]*)'
+    rb'|(?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)'
+    rb'|(?P<OPERATOR>==|!=|<=|>=|[-+*/=;(){}<>])'
+    rb'|(?P<MISMATCH>.)'
+)
+
+CLASS_SPACE = 0
+CLASS_NEWLINE = 1
+CLASS_WORD = 2
+CLASS_OPERATOR = 3
+CLASS_OTHER = 4
+
+if np is not None:
+    CHAR_CLASSES = np.full(256, CLASS_OTHER, dtype=np.uint8)
+    CHAR_CLASSES[list(b' \t\r')] = CLASS_SPACE
+    CHAR_CLASSES[ord('\n')] = CLASS_NEWLINE
+    CHAR_CLASSES[list(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.')] = CLASS_WORD
+    CHAR_CLASSES[list(b'+-*/=;(){}<>!')] = CLASS_OPERATOR
+    PAIR_FIRST = np.zeros(256, dtype=bool)
+    PAIR_FIRST[list(b'=!<>')] = True
+
+
 class Lexer:
     KEYWORDS = {
         'var': TokenType.VAR,
@@ -56,12 +188,61 @@ class Lexer:
         'print': TokenType.PRINT,
     }
 
-    def __init__(self, source_code: str):
+    OPERATORS = {
+        '==': TokenType.EQUAL,
+        '!=': TokenType.NOT_EQUAL,
+        '<=': TokenType.LESS_EQUAL,
+        '>=': TokenType.GREATER_EQUAL,
+        '+': TokenType.PLUS,
+        '-': TokenType.MINUS,
+        '*': TokenType.MULTIPLY,
+        '/': TokenType.DIVIDE,
+        '=': TokenType.ASSIGN,
+        ';': TokenType.SEMICOLON,
+        '(': TokenType.LPAREN,
+        ')': TokenType.RPAREN,
+        '{': TokenType.LBRACE,
+        '}': TokenType.RBRACE,
+        '<': TokenType.LESS_THAN,
+        '>': TokenType.GREATER_THAN,
+    }
+
+    PARALLEL_THRESHOLD = 1 << 20
+
+    def __init__(self, source_code: Union[str, bytes, mmap.mmap], first_line: int = 1,
+                 names: Optional[NameTable] = None):
         self.source_code = source_code
+        self.first_line = first_line
+        self.names = names if names is not None else NameTable()
+        self.words: Dict[str, Tuple[TokenType, str, Optional[int]]] = {}
         self.position = 0
-        self.line = 1
+        self.line = first_line
         self.column = 1
         self.tokens: List[Token] = []
+        self._line_index: Optional[LineIndex] = None
+
+    @classmethod
+    def from_mapped_file(cls, filepath: str) -> 'Lexer':
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b'')
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self):
+        if isinstance(self.source_code, mmap.mmap):
+            self.source_code.close()
+
+    def __enter__(self) -> 'Lexer':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def line_index(self) -> LineIndex:
+        if self._line_index is None:
+            self._line_index = LineIndex(self.source_code, self.first_line)
+        return self._line_index
 
     def current_char(self) -> Optional[str]:
         if self.position >= len(self.source_code):
@@ -121,6 +302,307 @@ class Lexer:
         return Token(token_type, id_str, start_line, start_column)
 
     def tokenize(self) -> List[Token]:
+        self.position = 0
+        tokens = list(self.scan(self.source_code, self.first_line))
+        tokens.append(Token(TokenType.EOF, None, self.line, self.column))
+        self.tokens = tokens
+        return tokens
+
+    def iter_tokens(self, stream: Optional[TextIO] = None,
+                    chunk_size: int = 1 << 16) -> Iterator[Token]:
+        self.position = 0
+        self.line = self.first_line
+        self.column = 1
+
+        if stream is None:
+            yield from self.scan(self.source_code, self.first_line)
+            yield Token(TokenType.EOF, None, self.line, self.column)
+            return
+
+        pending = ''
+
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+
+            pending += chunk
+            cut = pending.rfind('\n') + 1
+            if cut:
+                yield from self.scan(pending[:cut], self.line)
+                pending = pending[cut:]
+
+        yield from self.scan(pending, self.line)
+        yield Token(TokenType.EOF, None, self.line, self.column)
+
+    def scan(self, text: str, line: int) -> Iterator[Token]:
+        keywords = self.KEYWORDS
+        operators = self.OPERATORS
+        names = self.names
+        words = self.words
+        identifier_type = TokenType.IDENTIFIER
+        number_type = TokenType.NUMBER
+        line_start = 0
+
+        for match in TOKEN_REGEX.finditer(text):
+            kind = match.lastgroup
+
+            if kind == 'SKIP':
+                continue
+
+            if kind == 'NEWLINE':
+                value = match.group()
+                line += value.count('\n')
+                line_start = match.start() + value.rfind('\n') + 1
+                continue
+
+            value = match.group()
+            column = match.start() - line_start + 1
+
+            if kind == 'IDENTIFIER':
+                word = words.get(value)
+                if word is None:
+                    token_type = keywords.get(value, identifier_type)
+                    if token_type == identifier_type:
+                        name_id = names.intern(value)
+                        word = words[value] = (token_type, names.names[name_id], name_id)
+                    else:
+                        word = words[value] = (token_type, value, None)
+                yield Token(word[0], word[1], line, column, word[2])
+            elif kind == 'OPERATOR':
+                yield Token(operators[value], value, line, column)
+            elif kind == 'NUMBER':
+                yield Token(number_type, float(value) if '.' in value else int(value), line, column)
+            else:
+                raise LexicalError(f"Caracter no reconocido '{value}' en linea {line}, columna {column}")
+
+        self.position += len(text)
+        self.line = line
+        self.column = len(text) - line_start + 1
+
+    def tokenize_buffer(self) -> TokenBuffer:
+        source = self.source_code
+        keywords = self.KEYWORDS
+        operators = self.OPERATORS
+        line_index = self.line_index
+        regex = TOKEN_REGEX if isinstance(source, str) else BYTES_TOKEN_REGEX
+        buffer = TokenBuffer(line_index, self.names)
+        interned = buffer.interned
+        add_type = buffer.types.append
+        add_start = buffer.starts.append
+        add_length = buffer.lengths.append
+        add_value = buffer.value_ids.append
+
+        for match in regex.finditer(source):
+            kind = match.lastgroup
+
+            if kind == 'SKIP' or kind == 'NEWLINE':
+                continue
+
+            text = match.group()
+            entry = interned.get(text)
+
+            if entry is None:
+                key = text
+                if not isinstance(text, str):
+                    text = text.decode('latin-1')
+
+                if kind == 'IDENTIFIER':
+                    token_type = keywords.get(text, TokenType.IDENTIFIER)
+                    value = text
+                elif kind == 'OPERATOR':
+                    token_type = operators[text]
+                    value = text
+                elif kind == 'NUMBER':
+                    token_type = TokenType.NUMBER
+                    value = float(text) if '.' in text else int(text)
+                else:
+                    line, column = line_index.position(match.start())
+                    if key is not text and not text.isascii():
+                        raise LexicalError(f"Byte no ASCII 0x{ord(text):02X} en linea {line}, columna {column}")
+                    raise LexicalError(f"Caracter no reconocido '{text}' en linea {line}, columna {column}")
+
+                entry = buffer.intern(key, token_type, value)
+
+            add_type(entry[0])
+            add_start(match.start())
+            add_length(len(text))
+            add_value(entry[1])
+
+        self.position = len(source)
+        self.line, self.column = line_index.position(len(source))
+        add_type(TokenType.EOF.value)
+        add_start(len(source))
+        add_length(0)
+        add_value(0)
+        self.tokens = buffer
+        return buffer
+
+    def tokenize_parallel(self, workers: Optional[int] = None) -> TokenBuffer:
+        source = self.source_code
+        workers = workers or os.cpu_count() or 1
+
+        if workers < 2 or len(source) < self.PARALLEL_THRESHOLD:
+            return self.tokenize_buffer()
+
+        newline = '\n' if isinstance(source, str) else b'\n'
+        chunk_size = len(source) // workers
+        chunks = []
+        start = 0
+        first_line = self.first_line
+
+        while start < len(source):
+            end = source.find(newline, start + chunk_size) + 1 or len(source)
+            chunk = source[start:end]
+            chunks.append((chunk, first_line, start))
+            first_line += chunk.count(newline)
+            start = end
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(tokenize_chunk, *zip(*chunks)))
+
+        line_index = self.line_index
+        buffer = TokenBuffer(line_index, self.names)
+        interned = buffer.interned
+
+        for part in parts:
+            mapping = [0] * len(part.values)
+            for text, (code, value_id) in part.interned.items():
+                entry = interned.get(text)
+                if entry is None:
+                    entry = buffer.intern(text, TOKEN_TYPES[code], part.values[value_id])
+                mapping[value_id] = entry[1]
+
+            count = len(part.types) - 1
+            buffer.types.extend(part.types[:count])
+            buffer.starts.extend(part.starts[:count])
+            buffer.lengths.extend(part.lengths[:count])
+            buffer.value_ids.extend(map(mapping.__getitem__, part.value_ids[:count]))
+
+        self.position = len(source)
+        self.line, self.column = line_index.position(len(source))
+        buffer.types.append(TokenType.EOF.value)
+        buffer.starts.append(len(source))
+        buffer.lengths.append(0)
+        buffer.value_ids.append(0)
+        self.tokens = buffer
+        return buffer
+
+    def tokenize_vectorized(self) -> TokenBuffer:
+        source = self.source_code
+
+        if np is None:
+            return self.tokenize_buffer()
+        if isinstance(source, str):
+            if not source.isascii():
+                return self.tokenize_buffer()
+            data = source.encode('ascii')
+        else:
+            data = source
+
+        size = len(data)
+        codes = np.frombuffer(data, dtype=np.uint8)
+        classes = CHAR_CLASSES[codes]
+
+        slashes = np.flatnonzero((codes[:-1] == ord('/')) & (codes[1:] == ord('/')))
+        if slashes.size:
+            newlines = np.flatnonzero(codes == ord('\n'))
+            line_of = np.searchsorted(newlines, slashes)
+            lines, first = np.unique(line_of, return_index=True)
+            comment_ends = np.append(newlines, size)[lines]
+            depth = np.zeros(size + 1, dtype=np.int8)
+            depth[slashes[first]] = 1
+            depth[comment_ends] -= 1
+            classes[np.cumsum(depth[:-1], dtype=np.int8).astype(bool)] = CLASS_SPACE
+
+        boundary = np.empty(size, dtype=bool)
+        boundary[:1] = True
+        np.not_equal(classes[1:], classes[:-1], out=boundary[1:])
+        boundary |= classes == CLASS_OPERATOR
+
+        pairs = np.flatnonzero(PAIR_FIRST[codes[:-1]] & (codes[1:] == ord('='))
+                               & (classes[:-1] == CLASS_OPERATOR))
+        if pairs.size:
+            run_start = np.ones(pairs.size, dtype=bool)
+            run_start[1:] = pairs[1:] != pairs[:-1] + 1
+            first_in_run = pairs[run_start][np.cumsum(run_start) - 1]
+            boundary[pairs[(pairs - first_in_run) % 2 == 0] + 1] = False
+
+        segments = np.flatnonzero(boundary)
+        segment_ends = np.append(segments[1:], size)
+        is_token = classes[segments] > CLASS_NEWLINE
+
+        buffer = self.tokenize_segments(
+            data, segments[is_token].tolist(), segment_ends[is_token].tolist()
+        )
+        self.tokens = buffer
+        return buffer
+
+    def tokenize_segments(self, data: bytes, starts: List[int], ends: List[int]) -> TokenBuffer:
+        keywords = self.KEYWORDS
+        operators = self.OPERATORS
+        line_index = self.line_index
+        buffer = TokenBuffer(line_index, self.names)
+        interned = buffer.interned
+        add_type = buffer.types.append
+        add_start = buffer.starts.append
+        add_length = buffer.lengths.append
+        add_value = buffer.value_ids.append
+
+        for start, end in zip(starts, ends):
+            text = data[start:end]
+            entry = interned.get(text)
+
+            if entry is not None:
+                add_type(entry[0])
+                add_start(start)
+                add_length(end - start)
+                add_value(entry[1])
+                continue
+
+            for match in BYTES_TOKEN_REGEX.finditer(data, start, end):
+                key = match.group()
+                entry = interned.get(key)
+
+                if entry is None:
+                    kind = match.lastgroup
+                    text = key.decode('latin-1')
+
+                    if kind == 'IDENTIFIER':
+                        token_type = keywords.get(text, TokenType.IDENTIFIER)
+                        value = text
+                    elif kind == 'OPERATOR':
+                        token_type = operators[text]
+                        value = text
+                    elif kind == 'NUMBER':
+                        token_type = TokenType.NUMBER
+                        value = float(text) if '.' in text else int(text)
+                    else:
+                        line, column = line_index.position(match.start())
+                        if not text.isascii():
+                            raise LexicalError(f"Byte no ASCII 0x{ord(text):02X} en linea {line}, columna {column}")
+                        raise LexicalError(f"Caracter no reconocido '{text}' en linea {line}, columna {column}")
+
+                    entry = buffer.intern(key, token_type, value)
+
+                add_type(entry[0])
+                add_start(match.start())
+                add_length(len(key))
+                add_value(entry[1])
+
+        size = len(data)
+        self.position = size
+        self.line, self.column = line_index.position(size)
+        add_type(TokenType.EOF.value)
+        add_start(size)
+        add_length(0)
+        add_value(0)
+        return buffer
+
+    def tokenize_char_by_char(self) -> List[Token]:
+        self.position = 0
+        self.line = self.first_line
+        self.column = 1
         self.tokens = []
 
         while self.current_char() is not None:
@@ -198,20 +680,28 @@ class Lexer:
         self.tokens.append(Token(TokenType.EOF, None, self.line, self.column))
         return self.tokens
 
-    def print_tokens(self):
-        print("\n" + "="*60)
-        print("ANALISIS LEXICO - TABLA DE TOKENS")
-        print("="*60)
-        print(f"{'Tipo':<20} {'Valor':<15} {'Linea':<10} {'Columna':<10}")
-        print("-"*60)
+    def print_tokens(self, file: Optional[TextIO] = None):
+        print("\n" + "="*60, file=file)
+        print("ANALISIS LEXICO - TABLA DE TOKENS", file=file)
+        print("="*60, file=file)
+        print(f"{'Tipo':<20} {'Valor':<15} {'Linea':<10} {'Columna':<10}", file=file)
+        print("-"*60, file=file)
 
         for token in self.tokens:
             if token.type != TokenType.EOF:
-                print(f"{token.type.name:<20} {str(token.value):<15} {token.line:<10} {token.column:<10}")
+                print(f"{token.type.name:<20} {str(token.value):<15} {token.line:<10} {token.column:<10}", file=file)
+
+        print("="*60, file=file)
+        print(f"Total de tokens: {len(self.tokens) - 1}", file=file)
+        print("="*60 + "\n", file=file)
+
 
-        print("="*60)
-        print(f"Total de tokens: {len(self.tokens) - 1}")
-        print("="*60 + "\n")
+def tokenize_chunk(chunk: Union[str, bytes], first_line: int, offset: int) -> TokenBuffer:
+    buffer = Lexer(chunk, first_line).tokenize_buffer()
+    buffer.starts = array('I', [start + offset for start in buffer.starts])
+    buffer.line_index = None
+    buffer.names = None
+    return buffer
 
 
 if __name__ == "__main__":
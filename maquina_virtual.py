@@ -0,0 +1,174 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from codigo_intermedio import ThreeAddressCode
+
+
+class ExecutionError(Exception):
+    pass
+
+
+ASSIGN, ADD, SUB, MUL, DIV = 0, 1, 2, 3, 4
+EQ, NE, LT, GT, LE, GE = 5, 6, 7, 8, 9, 10
+NEG, POS, IF_FALSE, IF_TRUE, GOTO, PRINT = 11, 12, 13, 14, 15, 16
+
+OPCODES = {
+    'ASSIGN': ASSIGN, '+': ADD, '-': SUB, '*': MUL, '/': DIV,
+    '==': EQ, '!=': NE, '<': LT, '>': GT, '<=': LE, '>=': GE,
+    'UNARY_MINUS': NEG, 'UNARY_PLUS': POS,
+    'IF_FALSE': IF_FALSE, 'IF_TRUE': IF_TRUE, 'GOTO': GOTO, 'PRINT': PRINT,
+}
+
+JUMPS = (IF_FALSE, IF_TRUE, GOTO)
+
+
+def divide(left: Union[int, float], right: Union[int, float]) -> Union[int, float]:
+    if right == 0:
+        raise ExecutionError("Division por cero")
+    if isinstance(left, int) and isinstance(right, int):
+        quotient = abs(left) // abs(right)
+        return quotient if (left < 0) == (right < 0) else -quotient
+    return left / right
+
+
+def parse_constant(operand: str) -> Optional[Union[int, float]]:
+    if not operand:
+        return None
+    first = operand[1] if operand[0] == '-' and len(operand) > 1 else operand[0]
+    if not (first.isdigit() or first == '.'):
+        return None
+    try:
+        return int(operand)
+    except ValueError:
+        return float(operand)
+
+
+def resolve_labels(code: List[ThreeAddressCode]) -> Dict[str, int]:
+    labels: Dict[str, int] = {}
+    position = 0
+
+    for instruction in code:
+        if instruction.op == 'LABEL':
+            labels[instruction.result] = position
+        else:
+            position += 1
+
+    return labels
+
+
+class VirtualMachine:
+    def __init__(self, code: List[ThreeAddressCode], operand_slots: Optional[Dict[str, int]] = None):
+        self.names: Dict[str, int] = {}
+        self.initial: List[Any] = []
+        self.program: List[Tuple[int, int, int, int]] = []
+        self.origins: List[int] = []
+        self.registers: List[Any] = []
+        self.steps = 0
+        self.load(code, operand_slots or {})
+
+    def register(self, operand: Optional[str]) -> int:
+        if operand is None:
+            return -1
+
+        index = self.names.get(operand)
+        if index is None:
+            index = len(self.initial)
+            self.names[operand] = index
+            constant = parse_constant(operand)
+            self.initial.append(constant if constant is not None else 0)
+        return index
+
+    def load(self, code: List[ThreeAddressCode], operand_slots: Dict[str, int]):
+        for operand in sorted(operand_slots, key=operand_slots.get):
+            self.register(operand)
+        self.variables_count = len(self.initial)
+
+        labels = resolve_labels(code)
+
+        for origin, instruction in enumerate(code):
+            if instruction.op == 'LABEL':
+                continue
+
+            opcode = OPCODES.get(instruction.op)
+            if opcode is None:
+                raise ExecutionError(f"Instruccion desconocida: {instruction}")
+
+            if opcode in JUMPS:
+                target = labels.get(instruction.result)
+                if target is None:
+                    raise ExecutionError(f"Etiqueta no definida: {instruction.result}")
+                destination = target
+            else:
+                destination = self.register(instruction.result)
+
+            self.program.append((
+                opcode,
+                self.register(instruction.arg1),
+                self.register(instruction.arg2),
+                destination,
+            ))
+            self.origins.append(origin)
+
+    def variables(self) -> Dict[str, Any]:
+        registers = self.registers or self.initial
+        return {
+            name: registers[index]
+            for name, index in self.names.items()
+            if index < self.variables_count
+        }
+
+    def run(self, output: Optional[Callable[[Any], None]] = None) -> 'VirtualMachine':
+        output = output if output is not None else print
+        r = list(self.initial)
+        program = self.program
+        end = len(program)
+        pc = 0
+        steps = 0
+
+        try:
+            while pc < end:
+                op, a, b, d = program[pc]
+                pc += 1
+                steps += 1
+
+                if op == ASSIGN:
+                    r[d] = r[a]
+                elif op == ADD:
+                    r[d] = r[a] + r[b]
+                elif op == SUB:
+                    r[d] = r[a] - r[b]
+                elif op == MUL:
+                    r[d] = r[a] * r[b]
+                elif op == IF_FALSE:
+                    if not r[a]:
+                        pc = d
+                elif op == GOTO:
+                    pc = d
+                elif op == LT:
+                    r[d] = r[a] < r[b]
+                elif op == LE:
+                    r[d] = r[a] <= r[b]
+                elif op == GT:
+                    r[d] = r[a] > r[b]
+                elif op == GE:
+                    r[d] = r[a] >= r[b]
+                elif op == EQ:
+                    r[d] = r[a] == r[b]
+                elif op == NE:
+                    r[d] = r[a] != r[b]
+                elif op == DIV:
+                    r[d] = divide(r[a], r[b])
+                elif op == NEG:
+                    r[d] = -r[a]
+                elif op == POS:
+                    r[d] = +r[a]
+                elif op == IF_TRUE:
+                    if r[a]:
+                        pc = d
+                else:
+                    output(r[a])
+        except ExecutionError as e:
+            raise ExecutionError(f"Error de ejecucion (instruccion {self.origins[pc - 1]}): {str(e)}")
+        finally:
+            self.registers = r
+            self.steps = steps
+
+        return self
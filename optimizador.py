@@ -0,0 +1,351 @@
+import math
+from typing import Dict, List, Optional, Set, Tuple, Union
+from codigo_intermedio import ThreeAddressCode
+from flujo_datos import solve_dataflow
+from grafo_control import ControlFlowGraph
+from maquina_virtual import ExecutionError, divide, parse_constant
+
+
+ARITHMETIC = {'+', '-', '*', '/'}
+COMPARISONS = {'==', '!=', '<', '>', '<=', '>='}
+BRANCHES = {'IF_FALSE', 'IF_TRUE'}
+CONTROL = {'LABEL', 'GOTO', 'IF_FALSE', 'IF_TRUE', 'PRINT'}
+
+Number = Union[int, float]
+
+
+def literal(value: Number) -> Optional[str]:
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else None
+    return str(value)
+
+
+def is_int(value: Optional[Number]) -> bool:
+    return type(value) is int
+
+
+def evaluate(op: str, left: Number, right: Number) -> Optional[Union[Number, bool]]:
+    if op == '+':
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    if op == '/':
+        if right == 0:
+            return None
+        try:
+            return divide(left, right)
+        except (ExecutionError, OverflowError):
+            return None
+    if op == '==':
+        return left == right
+    if op == '!=':
+        return left != right
+    if op == '<':
+        return left < right
+    if op == '>':
+        return left > right
+    if op == '<=':
+        return left <= right
+    if op == '>=':
+        return left >= right
+    return None
+
+
+def join_kind(old: Optional[str], new: Optional[str]) -> Optional[str]:
+    if old is None or new is None:
+        return None
+    if old == new:
+        return old
+    return 'mixed'
+
+
+class ConstantFolder:
+    def __init__(self):
+        self.removed = 0
+        self.folded = 0
+        self.branches = 0
+        self.kinds: Dict[str, Optional[str]] = {}
+        self.assigned: Set[str] = set()
+        self.constants: Dict[str, Optional[Number]] = {}
+
+    def constant(self, operand: Optional[str]) -> Optional[Number]:
+        if operand is None:
+            return None
+        try:
+            return self.constants[operand]
+        except KeyError:
+            value = self.constants[operand] = parse_constant(operand)
+            return value
+
+    def kind(self, operand: str) -> Optional[str]:
+        if operand in self.kinds:
+            return self.kinds[operand]
+        constant = self.constant(operand)
+        if constant is not None:
+            return 'int' if is_int(constant) else 'float'
+        if operand not in self.assigned:
+            return 'int'
+        return None
+
+    def infer_kinds(self, code: List[ThreeAddressCode]):
+        kinds: Dict[str, Optional[str]] = {}
+        self.kinds = kinds
+        self.assigned = {instruction.result for instruction in code if instruction.op not in CONTROL}
+
+        changed = True
+        while changed:
+            changed = False
+            for instruction in code:
+                op = instruction.op
+                if op in CONTROL:
+                    continue
+
+                if op in COMPARISONS:
+                    kind = 'bool'
+                elif op == 'ASSIGN' or op in ('UNARY_MINUS', 'UNARY_PLUS'):
+                    kind = self.kind(instruction.arg1)
+                else:
+                    left = self.kind(instruction.arg1)
+                    right = self.kind(instruction.arg2)
+                    if left is None or right is None:
+                        kind = None
+                    elif 'mixed' in (left, right) or 'bool' in (left, right):
+                        kind = 'mixed'
+                    elif 'float' in (left, right):
+                        kind = 'float'
+                    else:
+                        kind = 'int'
+
+                result = instruction.result
+                if result not in kinds:
+                    kinds[result] = kind
+                    changed = True
+                    continue
+                old = kinds[result]
+                new = join_kind(old, kind)
+                if new != old:
+                    kinds[result] = new
+                    changed = True
+
+    def identity(self, op: str, left: str, right: str,
+                 left_value: Optional[Number], right_value: Optional[Number]) -> Optional[str]:
+        if op == '+':
+            if is_int(right_value) and right_value == 0 and self.kind(left) == 'int':
+                return left
+            if is_int(left_value) and left_value == 0 and self.kind(right) == 'int':
+                return right
+        elif op == '-':
+            if is_int(right_value) and right_value == 0 and self.kind(left) in ('int', 'float'):
+                return left
+        elif op == '*':
+            if is_int(right_value) and right_value == 1 and self.kind(left) in ('int', 'float'):
+                return left
+            if is_int(left_value) and left_value == 1 and self.kind(right) in ('int', 'float'):
+                return right
+            if is_int(right_value) and right_value == 0 and self.kind(left) == 'int':
+                return '0'
+            if is_int(left_value) and left_value == 0 and self.kind(right) == 'int':
+                return '0'
+        elif op == '/':
+            if is_int(right_value) and right_value == 1 and self.kind(left) in ('int', 'float'):
+                return left
+        return None
+
+    def optimize(self, code: List[ThreeAddressCode]) -> List[ThreeAddressCode]:
+        self.infer_kinds(code)
+        self.folded = 0
+        self.branches = 0
+
+        uses: Dict[str, int] = {}
+        branch_uses: Set[str] = set()
+        temporaries: Set[str] = set()
+        for instruction in code:
+            for operand in (instruction.arg1, instruction.arg2):
+                if operand is not None:
+                    uses[operand] = uses.get(operand, 0) + 1
+            if instruction.op in BRANCHES:
+                branch_uses.add(instruction.arg1)
+            elif instruction.op not in CONTROL and instruction.op != 'ASSIGN':
+                temporaries.add(instruction.result)
+
+        values: Dict[str, str] = {}
+        decided: Dict[str, bool] = {}
+        optimized: List[ThreeAddressCode] = []
+
+        for instruction in code:
+            op = instruction.op
+            left = values.get(instruction.arg1, instruction.arg1)
+            right = values.get(instruction.arg2, instruction.arg2)
+            result = instruction.result
+            replaceable = result in temporaries
+
+            if op in ARITHMETIC or op in COMPARISONS:
+                left_value = self.constant(left)
+                right_value = self.constant(right)
+
+                if left_value is not None and right_value is not None:
+                    value = evaluate(op, left_value, right_value)
+                    if op in COMPARISONS:
+                        if value is not None and uses.get(result) == 1 and result in branch_uses:
+                            decided[result] = value
+                            self.folded += 1
+                            continue
+                    elif value is not None and replaceable:
+                        text = literal(value)
+                        if text is not None:
+                            values[result] = text
+                            self.folded += 1
+                            continue
+                elif replaceable:
+                    simplified = self.identity(op, left, right, left_value, right_value)
+                    if simplified is not None:
+                        values[result] = simplified
+                        self.folded += 1
+                        continue
+
+            elif op in ('UNARY_MINUS', 'UNARY_PLUS') and replaceable:
+                value = self.constant(left)
+                if op == 'UNARY_PLUS' and (value is not None or self.kind(left) in ('int', 'float')):
+                    values[result] = left
+                    self.folded += 1
+                    continue
+                if op == 'UNARY_MINUS' and value is not None:
+                    values[result] = literal(-value)
+                    self.folded += 1
+                    continue
+
+            elif op in BRANCHES:
+                condition = decided.get(left)
+                if condition is None:
+                    value = self.constant(left)
+                    condition = None if value is None else bool(value)
+
+                if condition is not None:
+                    self.branches += 1
+                    if condition == (op == 'IF_TRUE'):
+                        optimized.append(ThreeAddressCode('GOTO', None, None, result))
+                    continue
+
+            if left is instruction.arg1 and right is instruction.arg2:
+                optimized.append(instruction)
+            else:
+                optimized.append(ThreeAddressCode(op, left, right, result))
+
+        self.removed = len(code) - len(optimized)
+        return optimized
+
+
+class DeadCodeEliminator:
+    def __init__(self):
+        self.removed = 0
+        self.dead_stores = 0
+        self.unreachable = 0
+        self.passes = 0
+
+    def removable(self, instruction: ThreeAddressCode) -> bool:
+        if instruction.op != '/':
+            return True
+        divisor = parse_constant(instruction.arg2)
+        return divisor is not None and divisor != 0
+
+    def liveness(self, graph: ControlFlowGraph, bodies: List[List[ThreeAddressCode]]) -> Tuple[Dict[str, int], List[int]]:
+        count = len(graph)
+        exposed: List[List[str]] = [[] for _ in range(count)]
+        defined: List[Set[str]] = [set() for _ in range(count)]
+        index: Dict[str, int] = {}
+
+        for block in range(count):
+            local = defined[block]
+            upward = exposed[block]
+            for instruction in bodies[block]:
+                op = instruction.op
+                for operand in (instruction.arg1, instruction.arg2):
+                    if operand is not None and operand not in local and parse_constant(operand) is None:
+                        upward.append(operand)
+                        if operand not in index:
+                            index[operand] = len(index)
+                if op not in CONTROL:
+                    local.add(instruction.result)
+
+        gen = [0] * count
+        kill = [0] * count
+        for block in range(count):
+            bits = 0
+            for operand in exposed[block]:
+                bits |= 1 << index[operand]
+            gen[block] = bits
+            bits = 0
+            for name in defined[block]:
+                position = index.get(name)
+                if position is not None:
+                    bits |= 1 << position
+            kill[block] = bits
+
+        _, live_out = solve_dataflow(graph.predecessors, graph.successors, gen, kill, forward=False)
+        return index, live_out
+
+    def sweep(self, body: List[ThreeAddressCode], index: Dict[str, int], live_out: int) -> List[ThreeAddressCode]:
+        below: Dict[str, bool] = {}
+        kept: List[ThreeAddressCode] = []
+
+        for instruction in reversed(body):
+            if instruction.op not in CONTROL:
+                result = instruction.result
+                live = below.get(result)
+                if live is None:
+                    position = index.get(result)
+                    live = position is not None and bool(live_out >> position & 1)
+                if not live and self.removable(instruction):
+                    self.dead_stores += 1
+                    continue
+                below[result] = False
+
+            for operand in (instruction.arg1, instruction.arg2):
+                if operand is not None:
+                    below[operand] = True
+            kept.append(instruction)
+
+        kept.reverse()
+        return kept
+
+    def optimize(self, code: List[ThreeAddressCode]) -> List[ThreeAddressCode]:
+        self.dead_stores = 0
+        self.unreachable = 0
+        self.passes = 0
+        graph = ControlFlowGraph(code)
+        order = [block for block in range(len(graph)) if graph.reachable(block)]
+        bodies = [graph.instructions(block) if graph.reachable(block) else [] for block in range(len(graph))]
+        self.unreachable = len(code) - sum(len(body) for body in bodies)
+
+        changed = True
+        while changed:
+            self.passes += 1
+            before = self.dead_stores
+            index, live_out = self.liveness(graph, bodies)
+            for block in order:
+                bodies[block] = self.sweep(bodies[block], index, live_out[block])
+            changed = self.dead_stores != before
+
+        optimized = self.remove_jumps(graph.linearize(order, bodies))
+        self.removed = len(code) - len(optimized)
+        return optimized
+
+    def remove_jumps(self, code: List[ThreeAddressCode]) -> List[ThreeAddressCode]:
+        kept: List[ThreeAddressCode] = []
+
+        for instruction in reversed(code):
+            if instruction.op == 'GOTO':
+                position = len(kept) - 1
+                while position >= 0 and kept[position].op == 'LABEL':
+                    if kept[position].result == instruction.result:
+                        break
+                    position -= 1
+                else:
+                    kept.append(instruction)
+                continue
+            kept.append(instruction)
+
+        kept.reverse()
+        return kept
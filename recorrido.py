@@ -0,0 +1,105 @@
+from types import GeneratorType
+from typing import Any, Callable, Dict, List
+
+
+class NodeVisitor:
+    dispatch_table: Dict[type, Callable[['NodeVisitor', Any], Any]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch_table = {}
+
+    @classmethod
+    def find_handler(cls, node_type: type) -> Callable[['NodeVisitor', Any], Any]:
+        handler = getattr(cls, f'visit_{node_type.__name__}', cls.generic_visit)
+        cls.dispatch_table[node_type] = handler
+        return handler
+
+    def visit(self, node: Any) -> Any:
+        table = self.dispatch_table
+        result = (table.get(type(node)) or self.find_handler(type(node)))(self, node)
+        if type(result) is not GeneratorType:
+            return result
+
+        stack: List[GeneratorType] = [result]
+        value = None
+
+        while stack:
+            try:
+                child = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                continue
+
+            result = (table.get(type(child)) or self.find_handler(type(child)))(self, child)
+            if type(result) is GeneratorType:
+                stack.append(result)
+                value = None
+            else:
+                value = result
+
+        return value
+
+    def generic_visit(self, node: Any):
+        raise Exception(f"No existe metodo visit_{type(node).__name__}")
+
+
+class FusedVisitor(NodeVisitor):
+    def __init__(self, *visitors: NodeVisitor):
+        self.visitors = visitors
+        self.dispatch_table = {}
+
+    def find_handler(self, node_type: type) -> Callable[['NodeVisitor', Any], Any]:
+        handlers = [
+            (visitor.dispatch_table.get(node_type) or visitor.find_handler(node_type), visitor)
+            for visitor in self.visitors
+        ]
+
+        def handler(fused: 'FusedVisitor', node: Any) -> Any:
+            results = [handler(visitor, node) for handler, visitor in handlers]
+            for result in results:
+                if type(result) is GeneratorType:
+                    return fused.lockstep(results)
+            return results
+
+        self.dispatch_table[node_type] = handler
+        return handler
+
+    def lockstep(self, results: List[Any]):
+        visitors = self.visitors
+        count = len(results)
+        values: List[Any] = [None] * count
+        active = [k for k in range(count) if type(results[k]) is GeneratorType]
+
+        while active:
+            requesting = []
+            children = []
+
+            for k in active:
+                try:
+                    children.append(results[k].send(values[k]))
+                    requesting.append(k)
+                except StopIteration as stop:
+                    results[k] = stop.value
+
+            if not children:
+                break
+
+            child = children[0]
+            shared = len(children) == count
+            if shared:
+                for other in children:
+                    if other is not child:
+                        shared = False
+                        break
+
+            if shared:
+                values = yield child
+            else:
+                for k, other in zip(requesting, children):
+                    values[k] = visitors[k].visit(other)
+
+            active = requesting
+
+        return results
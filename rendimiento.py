@@ -0,0 +1,964 @@
+import operator
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import fields
+from types import GeneratorType
+import lexico
+from lexico import Lexer, TokenType
+from sintactico import (
+    Parser, SyntaxError, ASTNode, ProgramNode, VarDeclarationNode, AssignmentNode,
+    BinaryOpNode, UnaryOpNode, NumberNode, IdentifierNode, IfNode, WhileNode, PrintNode
+)
+from semantico import SemanticAnalyzer
+from codigo_intermedio import IntermediateCodeGenerator, SemanticCodeGenerator
+from incremental import IncrementalParser, TextEdit
+from compilador import Compiler
+from recorrido import FusedVisitor, NodeVisitor
+from flujo_datos import DefiniteAssignment
+from diagnosticos import Diagnostics
+from maquina_virtual import VirtualMachine, divide
+from generador_python import PythonBackend
+from optimizador import ConstantFolder, DeadCodeEliminator
+from grafo_control import ControlFlowGraph
+
+
+def generate_program(blocks: int) -> str:
+    lines = []
+
+    for i in range(blocks):
+        lines.append(f"var a{i};")
+        lines.append(f"var b{i};")
+        lines.append(f"a{i} = {i} * 2 + 3.5;")
+        lines.append(f"b{i} = 0;")
+        lines.append(f"// bloque {i}")
+        lines.append(f"while (b{i} < 10) {{")
+        lines.append(f"    if (a{i} >= b{i}) {{")
+        lines.append(f"        a{i} = a{i} - (b{i} + 1) / 2;")
+        lines.append("    } else {")
+        lines.append(f"        print(a{i});")
+        lines.append("    }")
+        lines.append(f"    b{i} = b{i} + 1;")
+        lines.append("}")
+        lines.append(f"print(a{i} == b{i});")
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_expressions(statements: int) -> str:
+    lines = ["var a;", "var b;", "var c;", "var r;", "a = 1;", "b = 2;", "c = 3;"]
+    templates = [
+        "r = (a + {n}) * (b - {n}) / (c + 1) - -a * {n};",
+        "r = a * b + c * {n} - (a - b) * (c + {n}) / 2;",
+        "r = ((a + b) * (c - {n}) + {n}.5) * -(b + c) / (a + {n});",
+        "r = a + b * c - {n} / (a + 1) * (b - c) + +c;",
+        "print((a + b) * {n} >= c - a * {n});",
+    ]
+
+    for i in range(statements):
+        lines.append(templates[i % len(templates)].format(n=i % 97 + 1))
+
+    return "\n".join(lines) + "\n"
+
+
+class PrecedenceChainParser(Parser):
+    def parse_expression(self) -> ASTNode:
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> ASTNode:
+        node = self.parse_term()
+
+        while self.current_type in [
+            TokenType.LESS_THAN, TokenType.GREATER_THAN,
+            TokenType.LESS_EQUAL, TokenType.GREATER_EQUAL,
+            TokenType.EQUAL, TokenType.NOT_EQUAL
+        ]:
+            operator = self.current_value
+            line = self.current_line
+            self.advance()
+            right = self.parse_term()
+            node = BinaryOpNode(operator, node, right, line)
+
+        return node
+
+    def parse_term(self) -> ASTNode:
+        node = self.parse_factor()
+
+        while self.current_type in [TokenType.PLUS, TokenType.MINUS]:
+            operator = self.current_value
+            line = self.current_line
+            self.advance()
+            right = self.parse_factor()
+            node = BinaryOpNode(operator, node, right, line)
+
+        return node
+
+    def parse_factor(self) -> ASTNode:
+        node = self.parse_unary()
+
+        while self.current_type in [TokenType.MULTIPLY, TokenType.DIVIDE]:
+            operator = self.current_value
+            line = self.current_line
+            self.advance()
+            right = self.parse_unary()
+            node = BinaryOpNode(operator, node, right, line)
+
+        return node
+
+    def parse_unary(self) -> ASTNode:
+        if self.current_type in [TokenType.PLUS, TokenType.MINUS]:
+            operator = self.current_value
+            line = self.current_line
+            self.advance()
+            operand = self.parse_unary()
+            return UnaryOpNode(operator, operand, line)
+
+        return self.parse_primary()
+
+    def parse_primary(self) -> ASTNode:
+        if self.current_type == TokenType.NUMBER:
+            node = NumberNode(self.current_value, self.current_line)
+            self.advance()
+            return node
+
+        elif self.current_type == TokenType.IDENTIFIER:
+            line = self.current_line
+            identifier, symbol_id = self.expect_identifier()
+            return IdentifierNode(identifier, line, symbol_id)
+
+        elif self.current_type == TokenType.LPAREN:
+            self.advance()
+            node = self.parse_expression()
+            self.expect(TokenType.RPAREN)
+            return node
+
+        else:
+            raise SyntaxError(
+                f"Token inesperado: {self.current_type.name} "
+                f"en linea {self.current_line}, columna {self.current_column}"
+            )
+
+
+def visit_by_name(self, node):
+    result = getattr(self, f'visit_{type(node).__name__}', self.generic_visit)(node)
+    if type(result) is not GeneratorType:
+        return result
+
+    stack = [result]
+    value = None
+
+    while stack:
+        try:
+            child = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+
+        result = getattr(self, f'visit_{type(child).__name__}', self.generic_visit)(child)
+        if type(result) is GeneratorType:
+            stack.append(result)
+            value = None
+        else:
+            value = result
+
+    return value
+
+
+class NameDispatchAnalyzer(SemanticAnalyzer):
+    visit = visit_by_name
+
+
+class NameDispatchGenerator(IntermediateCodeGenerator):
+    visit = visit_by_name
+
+
+OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': divide,
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '>': operator.gt,
+    '<=': operator.le, '>=': operator.ge,
+}
+
+
+class ASTInterpreter(NodeVisitor):
+    def __init__(self, slots: int, output):
+        self.values = [0] * slots
+        self.output = output
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        for statement in node.statements:
+            yield statement
+
+    def visit_VarDeclarationNode(self, node: VarDeclarationNode):
+        self.values[node.slot] = 0
+
+    def visit_AssignmentNode(self, node: AssignmentNode):
+        self.values[node.slot] = yield node.expression
+
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        left = yield node.left
+        right = yield node.right
+        return OPERATORS[node.operator](left, right)
+
+    def visit_UnaryOpNode(self, node: UnaryOpNode):
+        operand = yield node.operand
+        return -operand if node.operator == '-' else +operand
+
+    def visit_NumberNode(self, node: NumberNode):
+        return node.value
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        return self.values[node.slot]
+
+    def visit_IfNode(self, node: IfNode):
+        if (yield node.condition):
+            for statement in node.then_block:
+                yield statement
+        else:
+            for statement in node.else_block:
+                yield statement
+
+    def visit_WhileNode(self, node: WhileNode):
+        while (yield node.condition):
+            for statement in node.body:
+                yield statement
+
+    def visit_PrintNode(self, node: PrintNode):
+        self.output((yield node.expression))
+
+
+def count_nodes(root: ASTNode) -> int:
+    count = 0
+    stack = [root]
+
+    while stack:
+        node = stack.pop()
+        count += 1
+        for node_field in fields(node):
+            value = getattr(node, node_field.name)
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(value)
+
+    return count
+
+
+def measure(function, repeat: int = 3) -> float:
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def measure_peak_memory(function) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def print_header(title: str):
+    print("\n" + "="*80)
+    print(title)
+    print("="*80)
+
+
+def bench_lexico(blocks: int = 20000):
+    source = generate_program(blocks)
+    token_count = len(Lexer(source).tokenize()) - 1
+
+    print_header("RENDIMIENTO - ANALISIS LEXICO")
+    print(f"Programa: {source.count(chr(10))} lineas, {len(source)} caracteres, {token_count} tokens")
+    print("-"*80)
+    print(f"{'Implementacion':<30} {'Tiempo (s)':<15} {'Tokens/s':<15}")
+    print("-"*80)
+
+    engines = [
+        ("Caracter a caracter", lambda: Lexer(source).tokenize_char_by_char()),
+        ("Expresion regular maestra", lambda: Lexer(source).tokenize()),
+    ]
+
+    for name, function in engines:
+        elapsed = measure(function)
+        print(f"{name:<30} {elapsed:<15.4f} {token_count / elapsed:<15,.0f}")
+
+    print("="*80 + "\n")
+
+
+def bench_streaming(blocks: int = 5000):
+    source = generate_program(blocks)
+
+    with tempfile.NamedTemporaryFile('w', suffix='.ml', delete=False, encoding='utf-8') as f:
+        f.write(source)
+        path = f.name
+
+    def parse_list():
+        with open(path, 'r', encoding='utf-8') as f:
+            lexer = Lexer(f.read())
+            Parser(lexer.tokenize(), lexer.names).parse()
+
+    def parse_stream():
+        with open(path, 'r', encoding='utf-8') as f:
+            lexer = Lexer('')
+            Parser(lexer.iter_tokens(f), lexer.names).parse()
+
+    print_header("RENDIMIENTO - LEXICO EN STREAMING")
+    print(f"Programa: {source.count(chr(10))} lineas, {len(source)} caracteres")
+    print("-"*80)
+    print(f"{'Modo':<30} {'Tiempo (s)':<15} {'Memoria pico (MB)':<20}")
+    print("-"*80)
+
+    try:
+        for name, function in [("Lista completa", parse_list), ("Iterador por bloques", parse_stream)]:
+            elapsed = measure(function)
+            peak = measure_peak_memory(function)
+            print(f"{name:<30} {elapsed:<15.4f} {peak / 1e6:<20.2f}")
+    finally:
+        os.remove(path)
+
+    print("="*80 + "\n")
+
+
+def bench_buffer(blocks: int = 10000):
+    source = generate_program(blocks)
+
+    print_header("RENDIMIENTO - BUFFER COMPACTO DE TOKENS")
+    print(f"Programa: {source.count(chr(10))} lineas, {len(source)} caracteres")
+    print("-"*80)
+    print(f"{'Representacion':<25} {'Lexico (s)':<15} {'Sintactico (s)':<15} {'Memoria tokens (MB)':<20}")
+    print("-"*80)
+
+    modes = [
+        ("Lista de Token", lambda: Lexer(source).tokenize()),
+        ("TokenBuffer", lambda: Lexer(source).tokenize_buffer()),
+    ]
+
+    for name, tokenize in modes:
+        lex_time = measure(tokenize)
+        lexer = Lexer(source)
+        tokens = lexer.tokenize() if name == "Lista de Token" else lexer.tokenize_buffer()
+        parse_time = measure(lambda: Parser(tokens, lexer.names).parse())
+        del tokens
+        peak = measure_peak_memory(tokenize)
+        print(f"{name:<25} {lex_time:<15.4f} {parse_time:<15.4f} {peak / 1e6:<20.2f}")
+
+    print("="*80 + "\n")
+
+
+def bench_mmap(blocks: int = 20000):
+    source = generate_program(blocks)
+
+    with tempfile.NamedTemporaryFile('w', suffix='.ml', delete=False, encoding='ascii') as f:
+        f.write(source)
+        path = f.name
+
+    def read_text():
+        with open(path, 'r', encoding='utf-8') as f:
+            Lexer(f.read()).tokenize()
+
+    def read_text_buffer():
+        with open(path, 'r', encoding='utf-8') as f:
+            Lexer(f.read()).tokenize_buffer()
+
+    def mapped_bytes():
+        with Lexer.from_mapped_file(path) as lexer:
+            lexer.tokenize_buffer()
+
+    print_header("RENDIMIENTO - LEXICO SOBRE ARCHIVO MAPEADO EN MEMORIA")
+    print(f"Archivo: {len(source) / 1e6:.1f} MB, {source.count(chr(10))} lineas")
+    print("-"*80)
+    print(f"{'Modo':<35} {'Tiempo (s)':<15} {'Memoria pico (MB)':<20}")
+    print("-"*80)
+
+    modes = [
+        ("read() + lista de Token", read_text),
+        ("read() + TokenBuffer", read_text_buffer),
+        ("mmap + bytes + TokenBuffer", mapped_bytes),
+    ]
+
+    try:
+        for name, function in modes:
+            elapsed = measure(function)
+            peak = measure_peak_memory(function)
+            print(f"{name:<35} {elapsed:<15.4f} {peak / 1e6:<20.2f}")
+    finally:
+        os.remove(path)
+
+    print("="*80 + "\n")
+
+
+def bench_paralelo(blocks: int = 40000):
+    source = generate_program(blocks)
+    serial_time = measure(lambda: Lexer(source).tokenize_buffer())
+
+    print_header("RENDIMIENTO - LEXICO EN PARALELO")
+    print(f"Programa: {len(source) / 1e6:.1f} MB, {source.count(chr(10))} lineas, "
+          f"{os.cpu_count()} CPUs disponibles")
+    print("-"*80)
+    print(f"{'Procesos':<15} {'Tiempo (s)':<15} {'Aceleracion':<15}")
+    print("-"*80)
+    print(f"{'serie':<15} {serial_time:<15.4f} {1.0:<15.2f}")
+
+    for workers in (1, 2, 4, 8):
+        elapsed = measure(lambda: Lexer(source).tokenize_parallel(workers))
+        print(f"{workers:<15} {elapsed:<15.4f} {serial_time / elapsed:<15.2f}")
+
+    print("="*80 + "\n")
+
+
+def bench_numpy(blocks: int = 20000):
+    source = generate_program(blocks)
+
+    print_header("RENDIMIENTO - CLASIFICACION VECTORIZADA DE CARACTERES")
+    if lexico.np is None:
+        print("NumPy no esta instalado: tokenize_vectorized() usa tokenize_buffer().")
+    print(f"Programa: {len(source) / 1e6:.1f} MB, {source.count(chr(10))} lineas")
+    print("-"*80)
+    print(f"{'Implementacion':<35} {'Tiempo (s)':<15}")
+    print("-"*80)
+
+    engines = [
+        ("Expresion regular (str)", lambda: Lexer(source).tokenize_buffer()),
+        ("Vectorizada (str)", lambda: Lexer(source).tokenize_vectorized()),
+        ("Expresion regular (bytes)", lambda: Lexer(source.encode('ascii')).tokenize_buffer()),
+        ("Vectorizada (bytes)", lambda: Lexer(source.encode('ascii')).tokenize_vectorized()),
+    ]
+
+    for name, function in engines:
+        print(f"{name:<35} {measure(function):<15.4f}")
+
+    print("="*80 + "\n")
+
+
+def bench_expresiones(statements: int = 40000):
+    source = generate_expressions(statements)
+    lexer = Lexer(source)
+    tokens = lexer.tokenize_buffer()
+
+    print_header("RENDIMIENTO - ANALISIS DE EXPRESIONES")
+    print(f"Programa: {statements} sentencias, {len(tokens) - 1} tokens")
+    print("-"*80)
+    print(f"{'Implementacion':<35} {'Tiempo (s)':<15} {'Tokens/s':<15}")
+    print("-"*80)
+
+    engines = [
+        ("Cadena de precedencia recursiva", PrecedenceChainParser),
+        ("Tabla de precedencia con pila", Parser),
+    ]
+
+    for name, parser_class in engines:
+        elapsed = measure(lambda: parser_class(tokens, lexer.names).parse())
+        print(f"{name:<35} {elapsed:<15.4f} {(len(tokens) - 1) / elapsed:<15,.0f}")
+
+    print("="*80 + "\n")
+
+
+def generate_nested(depth: int) -> str:
+    return (
+        "var a;\na = 1;\n"
+        + "while (a < 2) {\n" * depth
+        + "a = " + "(" * depth + "a + 1" + ")" * depth + ";\n"
+        + "}\n" * depth
+    )
+
+
+def bench_anidamiento(depths=(1000, 10000, 100000)):
+    print_header("RENDIMIENTO - ANIDAMIENTO PROFUNDO SIN RECURSION")
+    print(f"Limite de recursion de Python: {sys.getrecursionlimit()}")
+    print("-"*80)
+    print(f"{'Profundidad':<15} {'Sintactico (s)':<18} {'Semantico (s)':<18} {'Intermedio (s)':<18}")
+    print("-"*80)
+
+    for depth in depths:
+        lexer = Lexer(generate_nested(depth))
+        tokens = lexer.tokenize_buffer()
+
+        start = time.perf_counter()
+        ast = Parser(tokens, lexer.names).parse()
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        SemanticAnalyzer().analyze(ast)
+        semantic_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        IntermediateCodeGenerator().generate(ast)
+        intermediate_time = time.perf_counter() - start
+
+        print(f"{depth:<15} {parse_time:<18.4f} {semantic_time:<18.4f} {intermediate_time:<18.4f}")
+
+    print("="*80 + "\n")
+
+
+def bench_ast(statements: int = 60000):
+    source = generate_expressions(statements)
+    lexer = Lexer(source)
+    tokens = lexer.tokenize_buffer()
+
+    tracemalloc.start()
+    try:
+        ast = Parser(tokens, lexer.names).parse()
+        ast_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    node_count = count_nodes(ast)
+
+    print_header("RENDIMIENTO - MEMORIA DEL AST")
+    print(f"Programa: {statements} sentencias, {len(source) / 1e6:.1f} MB de codigo fuente")
+    print("-"*80)
+    print(f"Nodos:             {node_count:,}")
+    print(f"Memoria del AST:   {ast_bytes / 1e6:.2f} MB")
+    print(f"Bytes por nodo:    {ast_bytes / node_count:.1f}")
+    print(f"AST / fuente:      {ast_bytes / len(source):.1f}x")
+    print("="*80 + "\n")
+
+
+def bench_incremental(sizes=(10000, 100000)):
+    print_header("RENDIMIENTO - REANALISIS INCREMENTAL")
+    print(f"{'Lineas':<10} {'Completo (s)':<15} {'Editar linea (s)':<18} {'Insertar linea (s)':<20} {'Aceleracion':<12}")
+    print("-"*80)
+
+    for size in sizes:
+        source = generate_program(size // 14)
+        middle = source.count(chr(10)) // 2
+        incremental = IncrementalParser(source)
+
+        def full_parse():
+            lexer = Lexer(source)
+            Parser(lexer.tokenize(), lexer.names).parse()
+
+        def edit_line():
+            text = incremental.lines[middle - 1]
+            incremental.edit(TextEdit(middle, 1, middle, len(text), text.rstrip(chr(10))))
+
+        inserted = []
+
+        def insert_line():
+            if inserted:
+                incremental.edit(TextEdit(middle, 1, middle + 1, 1, ""))
+                inserted.pop()
+            else:
+                incremental.edit(TextEdit(middle, 1, middle, 1, "print(0);\n"))
+                inserted.append(True)
+
+        full_time = measure(full_parse)
+        edit_time = measure(edit_line, repeat=20)
+        insert_time = measure(insert_line, repeat=20)
+        print(f"{source.count(chr(10)):<10} {full_time:<15.4f} {edit_time:<18.6f} {insert_time:<20.6f} "
+              f"{full_time / edit_time:<12.0f}")
+
+    print("="*80 + "\n")
+
+
+def bench_flujo(blocks: int = 5000):
+    source = generate_program(blocks)
+
+    with tempfile.NamedTemporaryFile('w', suffix='.ml', delete=False, encoding='utf-8') as f:
+        f.write(source)
+        path = f.name
+
+    def compile_whole():
+        with open(path, 'r', encoding='utf-8') as f:
+            Compiler().compile(f.read(), verbose=False)
+
+    def compile_pipeline():
+        with open(path, 'r', encoding='utf-8') as f:
+            Compiler().compile_stream(f, lambda instruction: None, verbose=False)
+
+    print_header("RENDIMIENTO - COMPILACION SENTENCIA A SENTENCIA")
+    print(f"Programa: {source.count(chr(10))} lineas, {len(source)} caracteres")
+    print("-"*80)
+    print(f"{'Modo':<30} {'Tiempo (s)':<15} {'Memoria pico (MB)':<20}")
+    print("-"*80)
+
+    try:
+        for name, function in [("Fases completas", compile_whole), ("Sentencia a sentencia", compile_pipeline)]:
+            elapsed = measure(function)
+            peak = measure_peak_memory(function)
+            print(f"{name:<30} {elapsed:<15.4f} {peak / 1e6:<20.2f}")
+    finally:
+        os.remove(path)
+
+    print("="*80 + "\n")
+
+
+def bench_recorrido(blocks: int = 5000):
+    source = generate_program(blocks)
+    lexer = Lexer(source)
+    ast = Parser(lexer.tokenize_buffer(), lexer.names).parse()
+    node_count = count_nodes(ast)
+
+    def separate(analyzer_class, generator_class):
+        def run():
+            analyzer_class().analyze(ast)
+            generator_class().generate(ast)
+        return run
+
+    def fused():
+        analyzer = SemanticAnalyzer()
+        generator = IntermediateCodeGenerator()
+        analyzer.begin(ast.names)
+        generator.reset()
+        FusedVisitor(analyzer, generator).visit(ast)
+        analyzer.finish()
+
+    print_header("RENDIMIENTO - DESPACHO DE VISITANTES")
+    print(f"Programa: {source.count(chr(10))} lineas, {node_count:,} nodos (semantico + codigo intermedio)")
+    print("-"*80)
+    print(f"{'Despacho':<35} {'Tiempo (s)':<15} {'ns por nodo y pasada':<20}")
+    print("-"*80)
+
+    modes = [
+        ("getattr con nombre formateado", separate(NameDispatchAnalyzer, NameDispatchGenerator)),
+        ("Tabla por clase", separate(SemanticAnalyzer, IntermediateCodeGenerator)),
+        ("Tabla por clase, pasadas fusionadas", fused),
+        ("SemanticCodeGenerator", lambda: SemanticCodeGenerator().generate(ast)),
+    ]
+
+    for name, function in modes:
+        elapsed = measure(function)
+        print(f"{name:<35} {elapsed:<15.4f} {elapsed / (2 * node_count) * 1e9:<20.1f}")
+
+    print("="*80 + "\n")
+
+
+def generate_branches(variables: int) -> str:
+    declarations = [f"var v{i};\n" for i in range(variables)]
+    branches = [
+        f"if (v{i - 1} > 0) {{\n    v{i} = {i};\n}} else {{\n    v{i} = 0;\n}}\n"
+        f"while (v{i} < 3) {{\n    v{i} = v{i} + 1;\n}}\n"
+        for i in range(1, variables)
+    ]
+    return "".join(declarations + branches)
+
+
+def bench_asignacion(sizes=(10000, 50000)):
+    print_header("RENDIMIENTO - ASIGNACION DEFINIDA POR FLUJO DE DATOS")
+    print(f"{'Variables':<12} {'Semantico (s)':<18} {'Flujo (s)':<15} {'Advertencias':<15}")
+    print("-"*80)
+
+    for variables in sizes:
+        lexer = Lexer(generate_branches(variables))
+        ast = Parser(lexer.tokenize_buffer(), lexer.names).parse()
+
+        analyzer = SemanticAnalyzer()
+        start = time.perf_counter()
+        analyzer.analyze(ast)
+        semantic_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        DefiniteAssignment().analyze(ast)
+        flow_time = time.perf_counter() - start
+
+        print(f"{variables:<12} {semantic_time:<18.4f} {flow_time:<15.4f} {analyzer.diagnostics.warning_count:<15}")
+
+    print("="*80 + "\n")
+
+
+def generate_warnings(variables: int) -> str:
+    declarations = [f"var w{i};\n" for i in range(variables)]
+    uses = [f"var u{i};\nu{i} = w{i} + w{i};\n" for i in range(variables)]
+    return "".join(declarations + uses)
+
+
+def bench_diagnosticos(variables: int = 30000):
+    print_header("RENDIMIENTO - DIAGNOSTICOS ESTRUCTURADOS")
+
+    lexer = Lexer(generate_warnings(variables))
+    ast = Parser(lexer.tokenize_buffer(), lexer.names).parse()
+
+    def analyze(diagnostics: Diagnostics, render: bool):
+        analyzer = SemanticAnalyzer(diagnostics)
+        analyzer.analyze(ast)
+        if render:
+            "\n".join(str(warning) for warning in analyzer.warnings)
+        return analyzer.diagnostics.warning_count
+
+    count = analyze(Diagnostics(), False)
+    print(f"Variables: {variables}, advertencias: {count}")
+    print("-"*80)
+
+    modes = [
+        ("Registradas y formateadas", lambda: analyze(Diagnostics(), True)),
+        ("Registradas sin formatear", lambda: analyze(Diagnostics(), False)),
+        ("Maximo 100 advertencias", lambda: analyze(Diagnostics(max_warnings=100), False)),
+        ("Solo conteo", lambda: analyze(Diagnostics(count_only=True), False)),
+    ]
+
+    print(f"{'Modo':<30} {'Tiempo (s)':<15}")
+    print("-"*80)
+    for label, function in modes:
+        print(f"{label:<30} {measure(function):<15.4f}")
+
+    print("="*80 + "\n")
+
+
+def generate_loop(iterations: int) -> str:
+    return (
+        "var suma;\nvar i;\nvar limite;\n"
+        f"suma = 0;\ni = 1;\nlimite = {iterations};\n"
+        "while (i <= limite) {\n"
+        "    suma = suma + i * 2 - 1;\n"
+        "    i = i + 1;\n"
+        "}\n"
+        "print(suma);\n"
+    )
+
+
+def bench_maquina(iterations: int = 200000):
+    print_header("RENDIMIENTO - MAQUINA VIRTUAL DE CODIGO DE TRES DIRECCIONES")
+
+    example = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ejemplos', 'ejemplo4.ml')
+    with open(example, 'r', encoding='utf-8') as f:
+        programs = [("ejemplo4.ml", f.read(), 2000), (f"Bucle de {iterations} iteraciones", generate_loop(iterations), 1)]
+
+    print(f"{'Programa':<32} {'Carga (s)':<12} {'Ejecucion (s)':<15} {'Instrucciones':<15} {'Instr/s':<12}")
+    print("-"*80)
+
+    for label, source, repeat in programs:
+        compiler = Compiler()
+        compiler.compile_result(source)
+        output = []
+
+        start = time.perf_counter()
+        machine = VirtualMachine(compiler.intermediate_code, compiler.operand_slots)
+        load_time = time.perf_counter() - start
+
+        def run():
+            for _ in range(repeat):
+                machine.run(output.append)
+
+        run_time = measure(run)
+        steps = machine.steps * repeat
+        print(f"{label:<32} {load_time:<12.6f} {run_time:<15.4f} {steps:<15} {steps / run_time:<12.0f}")
+
+    print("="*80 + "\n")
+
+
+def bench_nativo(iterations: int = 200000):
+    print_header("RENDIMIENTO - EJECUCION: AST vs MAQUINA VIRTUAL vs CODIGO PYTHON")
+
+    example = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ejemplos', 'ejemplo4.ml')
+    with open(example, 'r', encoding='utf-8') as f:
+        programs = [("ejemplo4.ml", f.read(), 2000), (f"Bucle de {iterations} iteraciones", generate_loop(iterations), 1)]
+
+    for label, source, repeat in programs:
+        compiler = Compiler()
+        result = compiler.compile_result(source)
+        slots = len(result.symbol_table.slots)
+        output = []
+
+        start = time.perf_counter()
+        machine = VirtualMachine(compiler.intermediate_code, compiler.operand_slots)
+        machine_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        backend = PythonBackend(compiler.intermediate_code, compiler.operand_slots)
+        backend.compile()
+        backend_load = time.perf_counter() - start
+
+        def interpret():
+            for _ in range(repeat):
+                ASTInterpreter(slots, output.append).visit(result.ast)
+
+        def execute():
+            for _ in range(repeat):
+                machine.run(output.append)
+
+        def native():
+            for _ in range(repeat):
+                backend.run(output.append)
+
+        print(f"Programa: {label} ({repeat} ejecuciones)")
+        print("-"*80)
+        print(f"{'Motor':<30} {'Preparacion (s)':<18} {'Ejecucion (s)':<15} {'Aceleracion':<12}")
+        print("-"*80)
+
+        ast_time = measure(interpret)
+        for engine, load_time, run_time in [
+            ("Interprete del AST", 0.0, ast_time),
+            ("Maquina virtual (TAC)", machine_load, measure(execute)),
+            ("Codigo Python compilado", backend_load, measure(native)),
+        ]:
+            print(f"{engine:<30} {load_time:<18.6f} {run_time:<15.4f} {ast_time / run_time:.2f}x")
+
+        print(f"Estructurado: {'si' if backend.structured else 'no'}")
+        print("="*80 + "\n")
+
+
+def generate_constant_loop(iterations: int) -> str:
+    return (
+        "var suma;\nvar i;\n"
+        "suma = 0;\ni = 0;\n"
+        f"while (i < {iterations} * 1 + 0) {{\n"
+        "    suma = suma + i * (2 * 3 - 5) + (10 / 2 - 5) * i + 60 * 60 * 24;\n"
+        "    i = i + 1 * 1;\n"
+        "}\n"
+        "print(suma);\n"
+    )
+
+
+def bench_optimizacion(statements: int = 40000, iterations: int = 100000):
+    print_header("RENDIMIENTO - PLEGADO DE CONSTANTES Y SIMPLIFICACION ALGEBRAICA")
+    print(f"{'Programa':<30} {'Antes':<10} {'Despues':<10} {'Eliminadas':<12} {'Optimizar (s)':<15}")
+    print("-"*80)
+
+    programs = [
+        (f"Expresiones ({statements})", generate_expressions(statements)),
+        (f"Bucle ({iterations} iteraciones)", generate_constant_loop(iterations)),
+    ]
+    compiled = []
+
+    for label, source in programs:
+        compiler = Compiler()
+        compiler.compile_result(source)
+        code = compiler.intermediate_code
+
+        optimizer = ConstantFolder()
+        start = time.perf_counter()
+        optimized = optimizer.optimize(code)
+        optimize_time = time.perf_counter() - start
+
+        compiled.append((compiler, code, optimized))
+        print(f"{label:<30} {len(code):<10} {len(optimized):<10} {optimizer.removed:<12} {optimize_time:<15.4f}")
+
+    compiler, code, optimized = compiled[-1]
+    print("-"*80)
+    print(f"{'Ejecucion del bucle':<30} {'Instrucciones':<15} {'Tiempo (s)':<15}")
+    print("-"*80)
+
+    for label, program in [("Sin optimizar", code), ("Optimizado", optimized)]:
+        machine = VirtualMachine(program, compiler.operand_slots)
+        run_time = measure(lambda: machine.run(lambda value: None))
+        print(f"{label:<30} {machine.steps:<15} {run_time:<15.4f}")
+
+    print("="*80 + "\n")
+
+
+def bench_grafo(sizes=(5000, 10000, 20000)):
+    print_header("RENDIMIENTO - GRAFO DE FLUJO DE CONTROL SOBRE CODIGO DE TRES DIRECCIONES")
+    print(f"{'Fuente':<8} {'Instrucciones':<14} {'Bloques':<9} {'Grafo (s)':<11} "
+          f"{'Dominadores (s)':<16} {'Linealizar (s)':<14}")
+    print("-"*80)
+
+    for size in sizes:
+        compiler = Compiler()
+        compiler.compile_result(generate_program(size))
+        code = compiler.intermediate_code
+
+        graph = ControlFlowGraph(code)
+        build_time = measure(lambda: ControlFlowGraph(code))
+        dominators_time = measure(graph.compute_dominators)
+        linearize_time = measure(graph.linearize)
+        print(f"{size:<8} {len(code):<14} {len(graph):<9} {build_time:<11.4f} "
+              f"{dominators_time:<16.4f} {linearize_time:<14.4f}")
+
+    print("="*80 + "\n")
+
+
+def generate_dead_loop(iterations: int) -> str:
+    return (
+        "var suma;\nvar i;\nvar cuadrado;\nvar doble;\nvar modo;\n"
+        "suma = 0;\ni = 0;\nmodo = 0;\n"
+        f"while (i < {iterations}) {{\n"
+        "    cuadrado = i * i;\n"
+        "    doble = i + i;\n"
+        "    if (modo == 1) {\n"
+        "        print(cuadrado);\n"
+        "    }\n"
+        "    suma = suma + i;\n"
+        "    doble = suma * 2;\n"
+        "    i = i + 1;\n"
+        "}\n"
+        "print(suma);\n"
+    )
+
+
+def bench_codigo_muerto(blocks: int = 10000, statements: int = 40000, iterations: int = 100000):
+    print_header("RENDIMIENTO - VIVACIDAD Y ELIMINACION DE CODIGO MUERTO")
+    print(f"{'Programa':<28} {'Antes':<9} {'Despues':<9} {'Muertas':<9} {'Pasadas':<8} {'Eliminar (s)':<12}")
+    print("-"*80)
+
+    programs = [
+        (f"Bloques ({blocks})", generate_program(blocks)),
+        (f"Expresiones ({statements})", generate_expressions(statements)),
+        (f"Bucle ({iterations} iteraciones)", generate_dead_loop(iterations)),
+    ]
+    compiled = []
+
+    for label, source in programs:
+        compiler = Compiler()
+        compiler.compile_result(source)
+        code = compiler.intermediate_code
+
+        eliminator = DeadCodeEliminator()
+        start = time.perf_counter()
+        optimized = eliminator.optimize(code)
+        eliminate_time = time.perf_counter() - start
+
+        compiled.append((compiler, code, optimized))
+        print(f"{label:<28} {len(code):<9} {len(optimized):<9} {eliminator.dead_stores:<9} "
+              f"{eliminator.passes:<8} {eliminate_time:<12.4f}")
+
+    compiler, code, optimized = compiled[-1]
+    folded = ConstantFolder().optimize(code)
+    print("-"*80)
+    print(f"{'Ejecucion del bucle':<30} {'Instrucciones':<15} {'Tiempo (s)':<15}")
+    print("-"*80)
+
+    for label, program in [("Sin optimizar", code), ("Codigo muerto eliminado", optimized),
+                           ("Plegado + codigo muerto", DeadCodeEliminator().optimize(folded))]:
+        machine = VirtualMachine(program, compiler.operand_slots)
+        run_time = measure(lambda: machine.run(lambda value: None))
+        print(f"{label:<30} {machine.steps:<15} {run_time:<15.4f}")
+
+    print("="*80 + "\n")
+
+
+BENCHMARKS = {
+    'lexico': bench_lexico,
+    'streaming': bench_streaming,
+    'buffer': bench_buffer,
+    'mmap': bench_mmap,
+    'paralelo': bench_paralelo,
+    'numpy': bench_numpy,
+    'expresiones': bench_expresiones,
+    'anidamiento': bench_anidamiento,
+    'ast': bench_ast,
+    'incremental': bench_incremental,
+    'flujo': bench_flujo,
+    'recorrido': bench_recorrido,
+    'asignacion': bench_asignacion,
+    'diagnosticos': bench_diagnosticos,
+    'maquina': bench_maquina,
+    'nativo': bench_nativo,
+    'optimizacion': bench_optimizacion,
+    'grafo': bench_grafo,
+    'codigo_muerto': bench_codigo_muerto,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Benchmark desconocido: '{name}'. Disponibles: {', '.join(BENCHMARKS)}")
+            return
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
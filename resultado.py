@@ -0,0 +1,182 @@
+import io
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO
+from lexico import Lexer, Token
+from sintactico import Parser, ProgramNode
+from semantico import SemanticAnalyzer
+from tabla_simbolos import SymbolTable
+from codigo_intermedio import IntermediateCodeGenerator, ThreeAddressCode, print_code
+from diagnosticos import Diagnostics
+from optimizador import ConstantFolder, DeadCodeEliminator
+
+
+PHASES = [
+    ('lexico', "FASE 1: ANALISIS LEXICO"),
+    ('sintactico', "FASE 2: ANALISIS SINTACTICO"),
+    ('semantico', "FASE 3: ANALISIS SEMANTICO"),
+    ('intermedio', "FASE 4: GENERACION DE CODIGO INTERMEDIO"),
+    ('optimizacion', "FASE 5: OPTIMIZACION"),
+]
+
+
+def print_error(title: str, error: Exception, file: Optional[TextIO] = None):
+    print("\n" + "="*80, file=file)
+    print(title, file=file)
+    print("="*80, file=file)
+    print(f"\n{str(error)}\n", file=file)
+    print("="*80 + "\n", file=file)
+
+
+@dataclass
+class CompilationResult:
+    source: Any = field(default="", repr=False)
+    tokens: Sequence[Token] = field(default_factory=list)
+    ast: Optional[ProgramNode] = field(default=None, repr=False)
+    symbol_table: Optional[SymbolTable] = None
+    intermediate_code: List[ThreeAddressCode] = field(default_factory=list)
+    diagnostics: Diagnostics = field(default_factory=Diagnostics)
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[Exception] = None
+    error_title: Optional[str] = None
+    lexer: Optional[Lexer] = field(default=None, repr=False)
+    parser: Optional[Parser] = field(default=None, repr=False)
+    analyzer: Optional[SemanticAnalyzer] = field(default=None, repr=False)
+    generator: Optional[IntermediateCodeGenerator] = field(default=None, repr=False)
+    optimizer: Optional[ConstantFolder] = field(default=None, repr=False)
+    eliminator: Optional[DeadCodeEliminator] = field(default=None, repr=False)
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    def __bool__(self):
+        return self.success
+
+    @property
+    def token_count(self) -> int:
+        return max(len(self.tokens) - 1, 0)
+
+    def write_tokens(self, file: Optional[TextIO] = None):
+        self.lexer.print_tokens(file)
+
+    def write_ast(self, file: Optional[TextIO] = None):
+        self.parser.print_ast(self.ast, file=file)
+
+    def write_semantic(self, file: Optional[TextIO] = None):
+        self.analyzer.print_results(file)
+        self.symbol_table.print_table(file)
+
+    def write_code(self, file: Optional[TextIO] = None):
+        self.generator.print_code(file)
+
+    def write_optimized(self, file: Optional[TextIO] = None):
+        print_code(self.intermediate_code, file)
+
+    def write_phase(self, phase: str, file: Optional[TextIO] = None):
+        if phase == 'lexico':
+            print(f"Analisis lexico completado: {self.token_count} tokens encontrados", file=file)
+            self.write_tokens(file)
+        elif phase == 'sintactico':
+            print("Analisis sintactico completado", file=file)
+            print("\n" + "="*80, file=file)
+            print("ARBOL DE SINTAXIS ABSTRACTA (AST)", file=file)
+            print("="*80 + "\n", file=file)
+            self.write_ast(file)
+        elif phase == 'semantico':
+            print("Analisis semantico completado", file=file)
+            self.write_semantic(file)
+        elif phase == 'intermedio':
+            print("Generacion de codigo intermedio completada", file=file)
+            self.write_code(file)
+        elif phase == 'optimizacion':
+            print(f"Optimizacion completada: {self.optimizer.removed} instrucciones eliminadas "
+                  f"({self.optimizer.folded} operaciones plegadas, "
+                  f"{self.optimizer.branches} saltos resueltos)", file=file)
+            if self.eliminator is not None:
+                print(f"Eliminacion de codigo muerto: {self.eliminator.removed} instrucciones eliminadas "
+                      f"({self.eliminator.dead_stores} asignaciones muertas, "
+                      f"{self.eliminator.unreachable} inalcanzables)", file=file)
+            self.write_optimized(file)
+
+    def write_text(self, file: Optional[TextIO] = None):
+        print("\n" + "="*80, file=file)
+        print("COMPILADOR MINILANG", file=file)
+        print("="*80, file=file)
+
+        for phase, title in PHASES:
+            if self.success and phase not in self.timings:
+                continue
+            print("\n" + title, file=file)
+            print("-"*80, file=file)
+            if phase not in self.timings:
+                break
+            self.write_phase(phase, file)
+
+        if self.success:
+            print("\n" + "="*80, file=file)
+            print("COMPILACION EXITOSA", file=file)
+            print("="*80 + "\n", file=file)
+        else:
+            print_error(self.error_title, self.error, file)
+
+    def render(self, writer: Callable[[TextIO], None]) -> str:
+        buffer = io.StringIO()
+        writer(buffer)
+        return buffer.getvalue()
+
+    def text(self) -> str:
+        return self.render(self.write_text)
+
+    def to_dict(self, include_tokens: bool = False) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            'success': self.success,
+            'error': None,
+            'token_count': self.token_count,
+            'diagnostics': [
+                {
+                    'code': diagnostic.code,
+                    'severity': diagnostic.severity.name.lower(),
+                    'line': diagnostic.line,
+                    'column': diagnostic.column,
+                    'message': diagnostic.message,
+                }
+                for diagnostic in self.diagnostics.filter()
+            ],
+            'error_count': self.diagnostics.error_count,
+            'warning_count': self.diagnostics.warning_count,
+            'symbols': [],
+            'intermediate_code': [str(instruction) for instruction in self.intermediate_code],
+            'timings': dict(self.timings),
+        }
+
+        if self.optimizer is not None:
+            result['removed_instructions'] = self.optimizer.removed
+            if self.eliminator is not None:
+                result['removed_instructions'] += self.eliminator.removed
+
+        if self.error is not None:
+            result['error'] = {'phase': self.error_title, 'message': str(self.error)}
+
+        if include_tokens:
+            result['tokens'] = [
+                [token.type.name, token.value, token.line, token.column] for token in self.tokens
+            ]
+
+        if self.symbol_table is not None:
+            result['symbols'] = [
+                {
+                    'name': symbol.name,
+                    'slot': symbol.slot,
+                    'data_type': symbol.data_type,
+                    'line': symbol.line,
+                    'initialized': symbol.initialized,
+                    'used': symbol.used,
+                }
+                for symbol in self.symbol_table.slots
+            ]
+
+        return result
+
+    def to_json(self, include_tokens: bool = False, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(include_tokens), indent=indent, ensure_ascii=False)
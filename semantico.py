@@ -1,114 +1,139 @@
-from typing import Optional, Union
+import math
+from typing import List, Optional, TextIO, Union
+from lexico import NameTable
 from sintactico import (
     ASTNode, ProgramNode, VarDeclarationNode, AssignmentNode,
     BinaryOpNode, UnaryOpNode, NumberNode, IdentifierNode,
     IfNode, WhileNode, PrintNode
 )
-from tabla_simbolos import SymbolTable, SymbolType
+from tabla_simbolos import Symbol, SymbolTable, SymbolType
+from recorrido import NodeVisitor
+from flujo_datos import DefiniteAssignment
+from diagnosticos import Diagnostic, DiagnosticError, Diagnostics
 
 
 class SemanticError(Exception):
     pass
 
 
-class SemanticAnalyzer:
-    def __init__(self):
+class SemanticAnalyzer(NodeVisitor):
+    def __init__(self, diagnostics: Optional[Diagnostics] = None):
         self.symbol_table = SymbolTable()
-        self.errors = []
-        self.warnings = []
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        self.flow = DefiniteAssignment()
 
-    def analyze(self, ast: ASTNode) -> SymbolTable:
-        self.errors = []
-        self.warnings = []
+    @property
+    def errors(self) -> List[Diagnostic]:
+        return self.diagnostics.errors
 
-        try:
-            self.visit(ast)
-            self.warnings.extend(self.symbol_table.get_warnings())
+    @property
+    def warnings(self) -> List[Diagnostic]:
+        return self.diagnostics.warnings
+
+    def analyze(self, ast: ASTNode) -> SymbolTable:
+        self.begin(getattr(ast, 'names', None))
+        self.analyze_statement(ast)
+        return self.finish()
 
-            if self.errors:
-                error_msg = "\n".join(self.errors)
-                raise SemanticError(f"Se encontraron errores semanticos:\n{error_msg}")
+    def begin(self, names: Optional[NameTable] = None):
+        self.diagnostics.clear()
+        self.flow = DefiniteAssignment()
 
-            return self.symbol_table
+        if names is not None:
+            self.symbol_table.names = names
 
+    def analyze_statement(self, node: ASTNode):
+        try:
+            self.visit(node)
         except SemanticError:
             raise
         except Exception as e:
             raise SemanticError(f"Error durante el analisis semantico: {str(e)}")
 
-    def visit(self, node: ASTNode):
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        self.check_flow(node)
+
+    def check_flow(self, node: ASTNode):
+        for identifier in self.flow.analyze(node):
+            self.diagnostics.report('W001', identifier.line, identifier.name)
 
-    def generic_visit(self, node: ASTNode):
-        raise Exception(f"No existe metodo visit_{type(node).__name__}")
+    def finish(self) -> SymbolTable:
+        self.symbol_table.report_warnings(self.diagnostics)
+
+        if self.diagnostics.error_count:
+            error_msg = "\n".join(str(error) for error in self.errors)
+            raise SemanticError(f"Se encontraron errores semanticos:\n{error_msg}")
+
+        return self.symbol_table
+
+    def resolve(self, name: str, symbol_id: int) -> Optional[Symbol]:
+        if symbol_id < 0:
+            return self.symbol_table.lookup(name)
+        return self.symbol_table.lookup_id(symbol_id)
 
     def visit_ProgramNode(self, node: ProgramNode):
         for statement in node.statements:
-            self.visit(statement)
+            yield statement
 
     def visit_VarDeclarationNode(self, node: VarDeclarationNode):
         try:
-            self.symbol_table.declare(
+            symbol = self.symbol_table.declare(
                 name=node.identifier,
                 symbol_type=SymbolType.VARIABLE,
-                line=node.line
+                line=node.line,
+                symbol_id=node.symbol_id
             )
-        except Exception as e:
-            self.errors.append(str(e))
+            node.slot = symbol.slot
+        except DiagnosticError as e:
+            self.diagnostics.add(e.diagnostic)
 
     def visit_AssignmentNode(self, node: AssignmentNode):
-        if not self.symbol_table.exists(node.identifier):
-            self.errors.append(
-                f"Error semantico (linea {node.line}): "
-                f"Variable '{node.identifier}' no declarada."
-            )
+        symbol = self.resolve(node.identifier, node.symbol_id)
+        if symbol is None:
+            self.undeclared(node.identifier, node.line)
             return
 
-        expr_type = self.visit(node.expression)
-        self.symbol_table.mark_as_initialized(node.identifier)
+        node.slot = symbol.slot
+        expr_type = yield node.expression
+        symbol.initialized = True
         return expr_type
 
     def visit_BinaryOpNode(self, node: BinaryOpNode):
-        left_type = self.visit(node.left)
-        right_type = self.visit(node.right)
+        left_type = yield node.left
+        right_type = yield node.right
+        return self.binary_type(node, left_type, right_type)
 
+    def visit_UnaryOpNode(self, node: UnaryOpNode):
+        operand_type = yield node.operand
+        return self.unary_type(node, operand_type)
+
+    def undeclared(self, name: str, line: int):
+        self.diagnostics.report('E001', line, name)
+
+    def binary_type(self, node: BinaryOpNode, left_type: Optional[str], right_type: Optional[str]) -> Optional[str]:
         if node.operator in ['+', '-', '*', '/']:
             if left_type in ['int', 'float', None] and right_type in ['int', 'float', None]:
                 if left_type == 'float' or right_type == 'float':
                     return 'float'
                 return 'int'
             else:
-                self.errors.append(
-                    f"Error semantico (linea {node.line}): "
-                    f"Operador '{node.operator}' requiere operandos numericos."
-                )
+                self.diagnostics.report('E003', node.line, node.operator)
                 return None
 
         elif node.operator in ['==', '!=', '<', '>', '<=', '>=']:
             if left_type in ['int', 'float', None] and right_type in ['int', 'float', None]:
                 return 'bool'
             else:
-                self.errors.append(
-                    f"Error semantico (linea {node.line}): "
-                    f"Operador '{node.operator}' requiere operandos comparables."
-                )
+                self.diagnostics.report('E004', node.line, node.operator)
                 return None
 
         return None
 
-    def visit_UnaryOpNode(self, node: UnaryOpNode):
-        operand_type = self.visit(node.operand)
-
+    def unary_type(self, node: UnaryOpNode, operand_type: Optional[str]) -> Optional[str]:
         if node.operator in ['+', '-']:
             if operand_type in ['int', 'float', None]:
                 return operand_type
             else:
-                self.errors.append(
-                    f"Error semantico (linea {node.line}): "
-                    f"Operador unario '{node.operator}' requiere operando numerico."
-                )
+                self.diagnostics.report('E005', node.line, node.operator)
                 return None
 
         return None
@@ -117,68 +142,70 @@ class SemanticAnalyzer:
         if isinstance(node.value, int):
             return 'int'
         elif isinstance(node.value, float):
+            if not math.isfinite(node.value):
+                self.diagnostics.report('E006', node.line)
+                return None
             return 'float'
         return None
 
     def visit_IdentifierNode(self, node: IdentifierNode):
-        if not self.symbol_table.exists(node.name):
-            self.errors.append(
-                f"Error semantico (linea {node.line}): "
-                f"Variable '{node.name}' no declarada."
-            )
+        symbol = self.resolve(node.name, node.symbol_id)
+        if symbol is None:
+            self.undeclared(node.name, node.line)
             return None
 
-        self.symbol_table.mark_as_used(node.name)
-        symbol = self.symbol_table.lookup(node.name)
-
-        if not symbol.initialized:
-            self.warnings.append(
-                f"Advertencia (linea {node.line}): "
-                f"Variable '{node.name}' podria no estar inicializada."
-            )
-
+        node.slot = symbol.slot
+        symbol.used = True
         return symbol.data_type
 
     def visit_IfNode(self, node: IfNode):
-        self.visit(node.condition)
+        yield node.condition
 
+        self.symbol_table.enter_scope()
         for stmt in node.then_block:
-            self.visit(stmt)
+            yield stmt
+        self.symbol_table.exit_scope()
 
         if node.else_block:
+            self.symbol_table.enter_scope()
             for stmt in node.else_block:
-                self.visit(stmt)
+                yield stmt
+            self.symbol_table.exit_scope()
 
     def visit_WhileNode(self, node: WhileNode):
-        self.visit(node.condition)
+        yield node.condition
 
+        self.symbol_table.enter_scope()
         for stmt in node.body:
-            self.visit(stmt)
+            yield stmt
+        self.symbol_table.exit_scope()
 
     def visit_PrintNode(self, node: PrintNode):
-        self.visit(node.expression)
+        yield node.expression
 
-    def print_results(self):
-        print("\n" + "="*80)
-        print("ANALISIS SEMANTICO")
-        print("="*80)
+    def print_results(self, file: Optional[TextIO] = None):
+        print("\n" + "="*80, file=file)
+        print("ANALISIS SEMANTICO", file=file)
+        print("="*80, file=file)
 
         if self.errors:
-            print("\nERRORES ENCONTRADOS:")
-            print("-"*80)
+            print("\nERRORES ENCONTRADOS:", file=file)
+            print("-"*80, file=file)
             for error in self.errors:
-                print(f"  {error}")
-            print("="*80 + "\n")
+                print(f"  {error}", file=file)
+            print("="*80 + "\n", file=file)
         else:
-            print("\nNo se encontraron errores semanticos.")
-            print("="*80 + "\n")
+            print("\nNo se encontraron errores semanticos.", file=file)
+            print("="*80 + "\n", file=file)
 
-        if self.warnings:
-            print("ADVERTENCIAS:")
-            print("-"*80)
+        if self.diagnostics.warning_count:
+            print("ADVERTENCIAS:", file=file)
+            print("-"*80, file=file)
             for warning in self.warnings:
-                print(f"  {warning}")
-            print("="*80 + "\n")
+                print(f"  {warning}", file=file)
+            if self.diagnostics.omitted:
+                print(f"  ... {self.diagnostics.omitted} advertencias mas omitidas", file=file)
+            print("="*80 + "\n", file=file)
 
 
 if __name__ == "__main__":
@@ -201,7 +228,7 @@ if __name__ == "__main__":
     lexer = Lexer(codigo)
     tokens = lexer.tokenize()
 
-    parser = Parser(tokens)
+    parser = Parser(tokens, lexer.names)
     ast = parser.parse()
 
     analyzer = SemanticAnalyzer()
@@ -1,32 +1,39 @@
-from dataclasses import dataclass
-from typing import List, Optional, Union
-from lexico import Token, TokenType, Lexer
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from lexico import Token, TokenType, TokenBuffer, TOKEN_TYPES, Lexer, NameTable
+from recorrido import NodeVisitor
 
 
-@dataclass
+@dataclass(slots=True)
 class ASTNode:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramNode(ASTNode):
     statements: List[ASTNode]
+    names: Optional[NameTable] = field(default=None, compare=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclarationNode(ASTNode):
     identifier: str
     line: int
+    symbol_id: int = -1
+    slot: int = field(default=-1, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignmentNode(ASTNode):
     identifier: str
     expression: ASTNode
     line: int
+    symbol_id: int = -1
+    slot: int = field(default=-1, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOpNode(ASTNode):
     operator: str
     left: ASTNode
@@ -34,26 +41,28 @@ class BinaryOpNode(ASTNode):
     line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOpNode(ASTNode):
     operator: str
     operand: ASTNode
     line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class NumberNode(ASTNode):
     value: Union[int, float]
     line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class IdentifierNode(ASTNode):
     name: str
     line: int
+    symbol_id: int = -1
+    slot: int = field(default=-1, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class IfNode(ASTNode):
     condition: ASTNode
     then_block: List[ASTNode]
@@ -61,14 +70,14 @@ class IfNode(ASTNode):
     line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class WhileNode(ASTNode):
     condition: ASTNode
     body: List[ASTNode]
     line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class PrintNode(ASTNode):
     expression: ASTNode
     line: int
@@ -78,128 +87,265 @@ class SyntaxError(Exception):
     pass
 
 
+BINARY_PRECEDENCE = {
+    TokenType.EQUAL: 1,
+    TokenType.NOT_EQUAL: 1,
+    TokenType.LESS_THAN: 1,
+    TokenType.GREATER_THAN: 1,
+    TokenType.LESS_EQUAL: 1,
+    TokenType.GREATER_EQUAL: 1,
+    TokenType.PLUS: 2,
+    TokenType.MINUS: 2,
+    TokenType.MULTIPLY: 3,
+    TokenType.DIVIDE: 3,
+}
+
+UNARY_OPERATORS = frozenset({TokenType.PLUS, TokenType.MINUS})
+
+PREFIX_TOKENS = UNARY_OPERATORS | {TokenType.LPAREN}
+
+
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
-        self.position = 0
-        self.current_token = self.tokens[0] if tokens else None
+    def __init__(self, tokens: Union[Iterable[Token], TokenBuffer], names: Optional[NameTable] = None,
+                 recover: bool = False):
+        self.recover = recover
+        self.errors: List[str] = []
+        self.position = -1
+        self.current_type: Optional[TokenType] = None
+        self.current_value = None
+        self.current_line = 0
+        self.current_row = 0
+        self.current_column = 0
+        self.current_id: Optional[int] = None
+
+        if isinstance(tokens, TokenBuffer):
+            self.tokens = []
+            self.buffer = tokens
+            self.line_index = tokens.line_index
+            self.advance = self.advance_buffer
+            names = tokens.names
+        else:
+            self.tokens = tokens if isinstance(tokens, list) else []
+            self.buffer = None
+            self.line_index = None
+            self.token_stream = iter(tokens)
+
+        self.token_ids = names is not None
+        self.names = names if names is not None else NameTable()
+
+        self.advance()
+
+    @property
+    def current_token(self) -> Optional[Token]:
+        if self.current_type is None:
+            return None
+        return Token(self.current_type, self.current_value, self.current_line, self.current_column,
+                     self.current_id)
 
     def advance(self):
         self.position += 1
-        if self.position < len(self.tokens):
-            self.current_token = self.tokens[self.position]
+        token = next(self.token_stream, None)
+
+        if token is None:
+            self.current_type = None
+        else:
+            self.current_type = token.type
+            self.current_value = token.value
+            self.current_line = token.line
+            self.current_column = token.column
+            self.current_id = token.name_id
+
+    def advance_buffer(self):
+        self.position += 1
+        buffer = self.buffer
+
+        if self.position < len(buffer.types):
+            index = self.position
+            offset = buffer.starts[index]
+            line = bisect_right(self.line_index.starts, offset)
+            value_id = buffer.value_ids[index]
+            self.current_type = TOKEN_TYPES[buffer.types[index]]
+            self.current_value = buffer.values[value_id]
+            self.current_id = buffer.name_ids[value_id]
+            if line != self.current_row:
+                self.current_row = line
+                self.current_line = line + self.line_index.first_line - 1
+            self.current_column = offset - self.line_index.starts[line - 1] + 1
         else:
-            self.current_token = None
+            self.current_type = None
 
-    def expect(self, token_type: TokenType) -> Token:
-        if self.current_token is None:
+    def expect(self, token_type: TokenType):
+        if self.current_type is None:
             raise SyntaxError(f"Se esperaba {token_type.name} pero se llego al final del archivo")
 
-        if self.current_token.type != token_type:
+        if self.current_type != token_type:
             raise SyntaxError(
-                f"Se esperaba {token_type.name} pero se encontro {self.current_token.type.name} "
-                f"en linea {self.current_token.line}, columna {self.current_token.column}"
+                f"Se esperaba {token_type.name} pero se encontro {self.current_type.name} "
+                f"en linea {self.current_line}, columna {self.current_column}"
             )
 
-        token = self.current_token
+        value = self.current_value
         self.advance()
-        return token
+        return value
+
+    def expect_identifier(self) -> Tuple[str, int]:
+        if self.current_type == TokenType.IDENTIFIER:
+            name_id = self.current_id if self.token_ids else self.names.intern(self.current_value)
+        else:
+            name_id = -1
+
+        return self.expect(TokenType.IDENTIFIER), name_id
 
     def parse(self) -> ProgramNode:
-        statements = []
+        return ProgramNode(list(self.iter_statements()), self.names)
+
+    def iter_statements(self) -> Iterator[ASTNode]:
+        frames: List[Tuple[Optional[ASTNode], List[ASTNode]]] = []
+
+        while True:
+            token_type = self.current_type
+            position = self.position
+
+            try:
+                if token_type == TokenType.IF:
+                    node = self.parse_if_header()
+                    frames.append((node, node.then_block))
+                    continue
+
+                if token_type == TokenType.WHILE:
+                    node = self.parse_while_header()
+                    frames.append((node, node.body))
+                    continue
+
+                if frames and token_type == TokenType.RBRACE:
+                    self.advance()
+                    statement, block = frames.pop()
+
+                    if statement is None:
+                        if self.current_type == TokenType.ELSE:
+                            self.advance()
+                            self.expect(TokenType.LBRACE)
+                            frames.append((None, block))
+                        elif frames:
+                            frames[-1][1].extend(block)
+                        else:
+                            yield from block
+                        continue
+
+                    if isinstance(statement, IfNode) and block is statement.then_block \
+                            and self.current_type == TokenType.ELSE:
+                        self.advance()
+                        self.expect(TokenType.LBRACE)
+                        statement.else_block = []
+                        frames.append((statement, statement.else_block))
+                        continue
+
+                elif token_type is None or (token_type == TokenType.EOF and not frames):
+                    if frames:
+                        self.expect(TokenType.RBRACE)
+                    return
+
+                else:
+                    statement = self.parse_simple_statement()
+
+            except SyntaxError as error:
+                if not self.recover:
+                    raise
+
+                self.errors.append(str(error))
+
+                if self.current_type is None or self.current_type == TokenType.EOF:
+                    while frames:
+                        statement, block = frames.pop()
+                        statements = block if statement is None else [statement]
+                        if frames:
+                            frames[-1][1].extend(statements)
+                        else:
+                            yield from statements
+                    return
+
+                if self.synchronize(position, token_type in (TokenType.IF, TokenType.WHILE)):
+                    frames.append((None, []))
+                continue
+
+            if frames:
+                frames[-1][1].append(statement)
+            else:
+                yield statement
+
+    def synchronize(self, position: int, header: bool) -> bool:
+        while self.current_type is not None and self.current_type != TokenType.EOF:
+            if self.current_type == TokenType.SEMICOLON:
+                self.advance()
+                return False
+            if self.current_type == TokenType.RBRACE:
+                break
+            if header and self.current_type == TokenType.LBRACE:
+                self.advance()
+                return True
+            self.advance()
 
-        while self.current_token and self.current_token.type != TokenType.EOF:
-            stmt = self.parse_statement()
-            if stmt:
-                statements.append(stmt)
+        if self.position == position and self.current_type not in (None, TokenType.EOF):
+            self.advance()
+        return False
 
-        return ProgramNode(statements)
+    def parse_statement(self) -> ASTNode:
+        if self.current_type in (TokenType.IF, TokenType.WHILE):
+            return next(self.iter_statements())
+        return self.parse_simple_statement()
 
-    def parse_statement(self) -> Optional[ASTNode]:
-        if self.current_token.type == TokenType.VAR:
+    def parse_simple_statement(self) -> ASTNode:
+        if self.current_type == TokenType.VAR:
             return self.parse_var_declaration()
-        elif self.current_token.type == TokenType.IF:
-            return self.parse_if_statement()
-        elif self.current_token.type == TokenType.WHILE:
-            return self.parse_while_statement()
-        elif self.current_token.type == TokenType.PRINT:
+        elif self.current_type == TokenType.PRINT:
             return self.parse_print_statement()
-        elif self.current_token.type == TokenType.IDENTIFIER:
+        elif self.current_type == TokenType.IDENTIFIER:
             return self.parse_assignment()
         else:
             raise SyntaxError(
-                f"Sentencia no esperada: {self.current_token.type.name} "
-                f"en linea {self.current_token.line}"
+                f"Sentencia no esperada: {self.current_type.name} "
+                f"en linea {self.current_line}, columna {self.current_column}"
             )
 
     def parse_var_declaration(self) -> VarDeclarationNode:
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.VAR)
-        identifier_token = self.expect(TokenType.IDENTIFIER)
+        identifier, symbol_id = self.expect_identifier()
         self.expect(TokenType.SEMICOLON)
 
-        return VarDeclarationNode(identifier_token.value, line)
+        return VarDeclarationNode(identifier, line, symbol_id)
 
     def parse_assignment(self) -> AssignmentNode:
-        line = self.current_token.line
-        identifier_token = self.expect(TokenType.IDENTIFIER)
+        line = self.current_line
+        identifier, symbol_id = self.expect_identifier()
         self.expect(TokenType.ASSIGN)
         expression = self.parse_expression()
         self.expect(TokenType.SEMICOLON)
 
-        return AssignmentNode(identifier_token.value, expression, line)
+        return AssignmentNode(identifier, expression, line, symbol_id)
 
-    def parse_if_statement(self) -> IfNode:
-        line = self.current_token.line
+    def parse_if_header(self) -> IfNode:
+        line = self.current_line
         self.expect(TokenType.IF)
         self.expect(TokenType.LPAREN)
         condition = self.parse_expression()
         self.expect(TokenType.RPAREN)
         self.expect(TokenType.LBRACE)
 
-        then_block = []
-        while self.current_token and self.current_token.type != TokenType.RBRACE:
-            stmt = self.parse_statement()
-            if stmt:
-                then_block.append(stmt)
-
-        self.expect(TokenType.RBRACE)
+        return IfNode(condition, [], None, line)
 
-        else_block = None
-        if self.current_token and self.current_token.type == TokenType.ELSE:
-            self.advance()
-            self.expect(TokenType.LBRACE)
-
-            else_block = []
-            while self.current_token and self.current_token.type != TokenType.RBRACE:
-                stmt = self.parse_statement()
-                if stmt:
-                    else_block.append(stmt)
-
-            self.expect(TokenType.RBRACE)
-
-        return IfNode(condition, then_block, else_block, line)
-
-    def parse_while_statement(self) -> WhileNode:
-        line = self.current_token.line
+    def parse_while_header(self) -> WhileNode:
+        line = self.current_line
         self.expect(TokenType.WHILE)
         self.expect(TokenType.LPAREN)
         condition = self.parse_expression()
         self.expect(TokenType.RPAREN)
         self.expect(TokenType.LBRACE)
 
-        body = []
-        while self.current_token and self.current_token.type != TokenType.RBRACE:
-            stmt = self.parse_statement()
-            if stmt:
-                body.append(stmt)
-
-        self.expect(TokenType.RBRACE)
-
-        return WhileNode(condition, body, line)
+        return WhileNode(condition, [], line)
 
     def parse_print_statement(self) -> PrintNode:
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.PRINT)
         self.expect(TokenType.LPAREN)
         expression = self.parse_expression()
@@ -209,130 +355,134 @@ class Parser:
         return PrintNode(expression, line)
 
     def parse_expression(self) -> ASTNode:
-        return self.parse_comparison()
-
-    def parse_comparison(self) -> ASTNode:
-        node = self.parse_term()
-
-        while self.current_token and self.current_token.type in [
-            TokenType.LESS_THAN, TokenType.GREATER_THAN,
-            TokenType.LESS_EQUAL, TokenType.GREATER_EQUAL,
-            TokenType.EQUAL, TokenType.NOT_EQUAL
-        ]:
-            op_token = self.current_token
-            self.advance()
-            right = self.parse_term()
-            node = BinaryOpNode(op_token.value, node, right, op_token.line)
-
-        return node
-
-    def parse_term(self) -> ASTNode:
-        node = self.parse_factor()
-
-        while self.current_token and self.current_token.type in [TokenType.PLUS, TokenType.MINUS]:
-            op_token = self.current_token
-            self.advance()
-            right = self.parse_factor()
-            node = BinaryOpNode(op_token.value, node, right, op_token.line)
-
-        return node
-
-    def parse_factor(self) -> ASTNode:
-        node = self.parse_unary()
-
-        while self.current_token and self.current_token.type in [TokenType.MULTIPLY, TokenType.DIVIDE]:
-            op_token = self.current_token
-            self.advance()
-            right = self.parse_unary()
-            node = BinaryOpNode(op_token.value, node, right, op_token.line)
-
-        return node
-
-    def parse_unary(self) -> ASTNode:
-        if self.current_token and self.current_token.type in [TokenType.PLUS, TokenType.MINUS]:
-            op_token = self.current_token
-            self.advance()
-            operand = self.parse_unary()
-            return UnaryOpNode(op_token.value, operand, op_token.line)
-
-        return self.parse_primary()
-
-    def parse_primary(self) -> ASTNode:
-        if self.current_token.type == TokenType.NUMBER:
-            token = self.current_token
-            self.advance()
-            return NumberNode(token.value, token.line)
-
-        elif self.current_token.type == TokenType.IDENTIFIER:
-            token = self.current_token
-            self.advance()
-            return IdentifierNode(token.value, token.line)
-
-        elif self.current_token.type == TokenType.LPAREN:
-            self.advance()
-            node = self.parse_expression()
-            self.expect(TokenType.RPAREN)
-            return node
-
-        else:
-            raise SyntaxError(
-                f"Token inesperado: {self.current_token.type.name} "
-                f"en linea {self.current_token.line}"
-            )
-
-    def print_ast(self, node: ASTNode, indent: int = 0):
-        prefix = "  " * indent
-
-        if isinstance(node, ProgramNode):
-            print(f"{prefix}Programa:")
-            for stmt in node.statements:
-                self.print_ast(stmt, indent + 1)
-
-        elif isinstance(node, VarDeclarationNode):
-            print(f"{prefix}Declaracion de Variable: '{node.identifier}' (linea {node.line})")
-
-        elif isinstance(node, AssignmentNode):
-            print(f"{prefix}Asignacion: '{node.identifier}' = (linea {node.line})")
-            self.print_ast(node.expression, indent + 1)
-
-        elif isinstance(node, BinaryOpNode):
-            print(f"{prefix}Operacion Binaria: '{node.operator}' (linea {node.line})")
-            self.print_ast(node.left, indent + 1)
-            self.print_ast(node.right, indent + 1)
-
-        elif isinstance(node, UnaryOpNode):
-            print(f"{prefix}Operacion Unaria: '{node.operator}' (linea {node.line})")
-            self.print_ast(node.operand, indent + 1)
-
-        elif isinstance(node, NumberNode):
-            print(f"{prefix}Numero: {node.value} (linea {node.line})")
-
-        elif isinstance(node, IdentifierNode):
-            print(f"{prefix}Identificador: '{node.name}' (linea {node.line})")
-
-        elif isinstance(node, IfNode):
-            print(f"{prefix}If (linea {node.line}):")
-            print(f"{prefix}  Condicion:")
-            self.print_ast(node.condition, indent + 2)
-            print(f"{prefix}  Then:")
-            for stmt in node.then_block:
-                self.print_ast(stmt, indent + 2)
-            if node.else_block:
-                print(f"{prefix}  Else:")
-                for stmt in node.else_block:
-                    self.print_ast(stmt, indent + 2)
-
-        elif isinstance(node, WhileNode):
-            print(f"{prefix}While (linea {node.line}):")
-            print(f"{prefix}  Condicion:")
-            self.print_ast(node.condition, indent + 2)
-            print(f"{prefix}  Cuerpo:")
-            for stmt in node.body:
-                self.print_ast(stmt, indent + 2)
-
-        elif isinstance(node, PrintNode):
-            print(f"{prefix}Print (linea {node.line}):")
-            self.print_ast(node.expression, indent + 1)
+        operands: List[ASTNode] = []
+        operators: List[Optional[Tuple[int, str, int]]] = []
+        open_parens = 0
+        advance = self.advance
+
+        while True:
+            token_type = self.current_type
+
+            while token_type in PREFIX_TOKENS:
+                if token_type == TokenType.LPAREN:
+                    operators.append(None)
+                    open_parens += 1
+                else:
+                    operators.append((0, self.current_value, self.current_line))
+                advance()
+                token_type = self.current_type
+
+            if token_type == TokenType.NUMBER:
+                operands.append(NumberNode(self.current_value, self.current_line))
+                advance()
+            elif token_type == TokenType.IDENTIFIER:
+                line = self.current_line
+                identifier, symbol_id = self.expect_identifier()
+                operands.append(IdentifierNode(identifier, line, symbol_id))
+            else:
+                raise SyntaxError(
+                    f"Token inesperado: {self.current_type.name} "
+                    f"en linea {self.current_line}, columna {self.current_column}"
+                )
+
+            while True:
+                while operators and operators[-1] is not None and not operators[-1][0]:
+                    _, operator, line = operators.pop()
+                    operands.append(UnaryOpNode(operator, operands.pop(), line))
+
+                token_type = self.current_type
+                precedence = BINARY_PRECEDENCE.get(token_type)
+                if precedence is not None or not open_parens or token_type != TokenType.RPAREN:
+                    break
+
+                self.reduce_binary(operands, operators, 1)
+                operators.pop()
+                open_parens -= 1
+                advance()
+
+            if precedence is None:
+                self.reduce_binary(operands, operators, 1)
+                if open_parens:
+                    self.expect(TokenType.RPAREN)
+                return operands[0]
+
+            self.reduce_binary(operands, operators, precedence)
+            operators.append((precedence, self.current_value, self.current_line))
+            advance()
+
+    def reduce_binary(self, operands: List[ASTNode], operators: List[Optional[Tuple[int, str, int]]],
+                      min_precedence: int):
+        while operators and operators[-1] is not None and operators[-1][0] >= min_precedence:
+            _, operator, line = operators.pop()
+            right = operands.pop()
+            operands[-1] = BinaryOpNode(operator, operands[-1], right, line)
+
+    def print_ast(self, node: ASTNode, indent: int = 0, file: Optional[TextIO] = None):
+        ASTPrinter(indent, file).visit(node)
+
+
+class ASTPrinter(NodeVisitor):
+    def __init__(self, indent: int = 0, file: Optional[TextIO] = None):
+        self.indent = indent
+        self.file = file
+
+    @property
+    def prefix(self) -> str:
+        return "  " * self.indent
+
+    def indented(self, statements: List[ASTNode], depth: int):
+        self.indent += depth
+        for stmt in statements:
+            yield stmt
+        self.indent -= depth
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        print(f"{self.prefix}Programa:", file=self.file)
+        yield from self.indented(node.statements, 1)
+
+    def visit_VarDeclarationNode(self, node: VarDeclarationNode):
+        print(f"{self.prefix}Declaracion de Variable: '{node.identifier}' (linea {node.line})", file=self.file)
+
+    def visit_AssignmentNode(self, node: AssignmentNode):
+        print(f"{self.prefix}Asignacion: '{node.identifier}' = (linea {node.line})", file=self.file)
+        yield from self.indented([node.expression], 1)
+
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        print(f"{self.prefix}Operacion Binaria: '{node.operator}' (linea {node.line})", file=self.file)
+        yield from self.indented([node.left, node.right], 1)
+
+    def visit_UnaryOpNode(self, node: UnaryOpNode):
+        print(f"{self.prefix}Operacion Unaria: '{node.operator}' (linea {node.line})", file=self.file)
+        yield from self.indented([node.operand], 1)
+
+    def visit_NumberNode(self, node: NumberNode):
+        print(f"{self.prefix}Numero: {node.value} (linea {node.line})", file=self.file)
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        print(f"{self.prefix}Identificador: '{node.name}' (linea {node.line})", file=self.file)
+
+    def visit_IfNode(self, node: IfNode):
+        prefix = self.prefix
+        print(f"{prefix}If (linea {node.line}):", file=self.file)
+        print(f"{prefix}  Condicion:", file=self.file)
+        yield from self.indented([node.condition], 2)
+        print(f"{prefix}  Then:", file=self.file)
+        yield from self.indented(node.then_block, 2)
+        if node.else_block:
+            print(f"{prefix}  Else:", file=self.file)
+            yield from self.indented(node.else_block, 2)
+
+    def visit_WhileNode(self, node: WhileNode):
+        prefix = self.prefix
+        print(f"{prefix}While (linea {node.line}):", file=self.file)
+        print(f"{prefix}  Condicion:", file=self.file)
+        yield from self.indented([node.condition], 2)
+        print(f"{prefix}  Cuerpo:", file=self.file)
+        yield from self.indented(node.body, 2)
+
+    def visit_PrintNode(self, node: PrintNode):
+        print(f"{self.prefix}Print (linea {node.line}):", file=self.file)
+        yield from self.indented([node.expression], 1)
 
 
 if __name__ == "__main__":
@@ -352,7 +502,7 @@ if __name__ == "__main__":
     lexer = Lexer(codigo)
     tokens = lexer.tokenize()
 
-    parser = Parser(tokens)
+    parser = Parser(tokens, lexer.names)
     ast = parser.parse()
 
     print("\n" + "="*60)
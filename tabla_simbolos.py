@@ -1,6 +1,8 @@
-from dataclasses import dataclass
-from typing import Dict, Optional, Any
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, TextIO
 from enum import Enum, auto
+from lexico import NameTable
+from diagnosticos import Diagnostic, DiagnosticError, Diagnostics, Severity
 
 
 class SymbolType(Enum):
@@ -17,6 +19,10 @@ class Symbol:
     line: int = 0
     initialized: bool = False
     used: bool = False
+    symbol_id: int = -1
+    slot: int = -1
+    depth: int = 0
+    shadowed: Optional['Symbol'] = field(default=None, repr=False, compare=False)
 
     def __repr__(self):
         return (f"Symbol(name='{self.name}', type={self.symbol_type.name}, "
@@ -25,17 +31,37 @@ class Symbol:
 
 
 class SymbolTable:
-    def __init__(self):
-        self.symbols: Dict[str, Symbol] = {}
-        self.scopes: list = [{}]
+    def __init__(self, names: Optional[NameTable] = None):
+        self.names = names if names is not None else NameTable()
+        self.table: List[Optional[Symbol]] = []
+        self.slots: List[Symbol] = []
+        self.scopes: List[List[Symbol]] = [[]]
+
+    @property
+    def symbols(self) -> Dict[str, Symbol]:
+        return {symbol.name: symbol for symbol in self.slots}
+
+    @property
+    def depth(self) -> int:
+        return len(self.scopes) - 1
+
+    def enter_scope(self):
+        self.scopes.append([])
+
+    def exit_scope(self):
+        for symbol in reversed(self.scopes.pop()):
+            self.table[symbol.symbol_id] = symbol.shadowed
 
     def declare(self, name: str, symbol_type: SymbolType, line: int,
-                data_type: Optional[str] = None, value: Optional[Any] = None) -> Symbol:
-        if name in self.symbols:
-            existing_symbol = self.symbols[name]
-            raise Exception(
-                f"Error semantico: Variable '{name}' ya declarada en linea {existing_symbol.line}. "
-                f"Redeclaracion en linea {line}."
+                data_type: Optional[str] = None, value: Optional[Any] = None,
+                symbol_id: Optional[int] = None) -> Symbol:
+        if symbol_id is None or symbol_id < 0:
+            symbol_id = self.names.intern(name)
+
+        existing_symbol = self.lookup_id(symbol_id)
+        if existing_symbol is not None and existing_symbol.depth == self.depth:
+            raise DiagnosticError(
+                Diagnostic('E002', Severity.ERROR, line, 0, (name, existing_symbol.line))
             )
 
         symbol = Symbol(
@@ -44,23 +70,39 @@ class SymbolTable:
             data_type=data_type,
             value=value,
             line=line,
-            initialized=(value is not None)
+            initialized=(value is not None),
+            symbol_id=symbol_id,
+            slot=len(self.slots),
+            depth=self.depth,
+            shadowed=existing_symbol
         )
 
-        self.symbols[name] = symbol
+        if symbol_id >= len(self.table):
+            self.table.extend([None] * (symbol_id + 1 - len(self.table)))
+        self.table[symbol_id] = symbol
+        self.slots.append(symbol)
+        self.scopes[-1].append(symbol)
         return symbol
 
+    def lookup_id(self, symbol_id: int) -> Optional[Symbol]:
+        if 0 <= symbol_id < len(self.table):
+            return self.table[symbol_id]
+        return None
+
     def lookup(self, name: str) -> Optional[Symbol]:
-        return self.symbols.get(name)
+        symbol_id = self.names.ids.get(name)
+        if symbol_id is None:
+            return None
+        return self.lookup_id(symbol_id)
 
     def exists(self, name: str) -> bool:
-        return name in self.symbols
+        return self.lookup(name) is not None
 
     def update_value(self, name: str, value: Any):
-        if name not in self.symbols:
+        symbol = self.lookup(name)
+        if symbol is None:
             raise Exception(f"Error semantico: Variable '{name}' no declarada.")
 
-        symbol = self.symbols[name]
         symbol.value = value
         symbol.initialized = True
 
@@ -71,69 +113,68 @@ class SymbolTable:
                 symbol.data_type = 'float'
 
     def mark_as_used(self, name: str):
-        if name not in self.symbols:
+        symbol = self.lookup(name)
+        if symbol is None:
             raise Exception(f"Error semantico: Variable '{name}' no declarada.")
 
-        self.symbols[name].used = True
+        symbol.used = True
 
     def mark_as_initialized(self, name: str):
-        if name not in self.symbols:
+        symbol = self.lookup(name)
+        if symbol is None:
             raise Exception(f"Error semantico: Variable '{name}' no declarada.")
 
-        self.symbols[name].initialized = True
+        symbol.initialized = True
 
     def get_all_symbols(self) -> Dict[str, Symbol]:
-        return self.symbols.copy()
+        return self.symbols
 
-    def get_warnings(self) -> list:
-        warnings = []
+    def get_warnings(self) -> List[Diagnostic]:
+        diagnostics = Diagnostics()
+        self.report_warnings(diagnostics)
+        return diagnostics.warnings
 
-        for name, symbol in self.symbols.items():
+    def report_warnings(self, diagnostics: Diagnostics):
+        for symbol in self.slots:
             if not symbol.used:
-                warnings.append(
-                    f"Advertencia: Variable '{name}' declarada en linea {symbol.line} "
-                    f"pero nunca usada."
-                )
+                diagnostics.report('W002', symbol.line, symbol.name)
 
             if symbol.used and not symbol.initialized:
-                warnings.append(
-                    f"Advertencia: Variable '{name}' usada en el programa "
-                    f"pero podria no estar inicializada (declarada en linea {symbol.line})."
-                )
-
-        return warnings
+                diagnostics.report('W003', symbol.line, symbol.name)
 
-    def print_table(self):
-        print("\n" + "="*80)
-        print("TABLA DE SIMBOLOS")
-        print("="*80)
+    def print_table(self, file: Optional[TextIO] = None):
+        print("\n" + "="*80, file=file)
+        print("TABLA DE SIMBOLOS", file=file)
+        print("="*80, file=file)
         print(f"{'Nombre':<15} {'Tipo':<12} {'Tipo Dato':<12} {'Valor':<12} "
-              f"{'Linea':<8} {'Init':<6} {'Usado':<6}")
-        print("-"*80)
+              f"{'Linea':<8} {'Init':<6} {'Usado':<6}", file=file)
+        print("-"*80, file=file)
 
-        for name, symbol in sorted(self.symbols.items()):
+        symbols = sorted(self.slots, key=lambda symbol: (symbol.name, symbol.slot))
+        for symbol in symbols:
             value_str = str(symbol.value) if symbol.value is not None else "None"
             data_type_str = symbol.data_type if symbol.data_type else "?"
 
             print(f"{symbol.name:<15} {symbol.symbol_type.name:<12} {data_type_str:<12} "
                   f"{value_str:<12} {symbol.line:<8} {str(symbol.initialized):<6} "
-                  f"{str(symbol.used):<6}")
+                  f"{str(symbol.used):<6}", file=file)
 
-        print("="*80)
-        print(f"Total de simbolos: {len(self.symbols)}")
-        print("="*80 + "\n")
+        print("="*80, file=file)
+        print(f"Total de simbolos: {len(symbols)}", file=file)
+        print("="*80 + "\n", file=file)
 
         warnings = self.get_warnings()
         if warnings:
-            print("ADVERTENCIAS:")
-            print("-"*80)
+            print("ADVERTENCIAS:", file=file)
+            print("-"*80, file=file)
             for warning in warnings:
-                print(f"  {warning}")
-            print("="*80 + "\n")
+                print(f"  {warning}", file=file)
+            print("="*80 + "\n", file=file)
 
     def clear(self):
-        self.symbols.clear()
-        self.scopes = [{}]
+        self.table = []
+        self.slots = []
+        self.scopes = [[]]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compilador import Compiler  # noqa: E402
+from maquina_virtual import ExecutionError  # noqa: E402
+
+
+EXAMPLES = sorted(
+    os.path.join(ROOT, 'ejemplos', name) for name in os.listdir(os.path.join(ROOT, 'ejemplos'))
+    if name.endswith('.ml')
+)
+
+
+def random_expression(rng, names, depth):
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(names + ['0', '1', '2', '3', '0.0', '1.5', '2.25'])
+    if rng.random() < 0.1:
+        return f"{rng.choice('-+')}{random_expression(rng, names, depth - 1)}"
+    operator = rng.choice(['+', '-', '*', '/', '+', '*'])
+    return f"({random_expression(rng, names, depth - 1)} {operator} {random_expression(rng, names, depth - 1)})"
+
+
+def random_condition(rng, names):
+    operator = rng.choice(['<', '>', '<=', '>=', '==', '!='])
+    return f"{random_expression(rng, names, 2)} {operator} {random_expression(rng, names, 2)}"
+
+
+def random_statement(rng, names, depth):
+    choice = rng.random()
+    if depth > 0 and choice < 0.15:
+        return (f"if ({random_condition(rng, names)}) {{ {random_statement(rng, names, depth - 1)} }} "
+                f"else {{ {random_statement(rng, names, depth - 1)} }}")
+    if depth > 0 and choice < 0.25:
+        return f"k = 0; while (k < 3) {{ {random_statement(rng, names, depth - 1)} k = k + 1; }}"
+    if choice < 0.5:
+        return f"{rng.choice(names)} = {random_expression(rng, names, 3)};"
+    if choice < 0.55:
+        return f"{rng.choice(names)} = {random_condition(rng, names)};"
+    if choice < 0.65:
+        return f"print({random_condition(rng, names)});"
+    return f"print({random_expression(rng, names, 3)});"
+
+
+def random_program(rng):
+    names = ['a', 'b', 'c', 't0']
+    declarations = ' '.join(f"var {name};" for name in names + ['k'])
+    initial = ' '.join(f"{name} = {rng.choice(['1', '2', '3', '0.5', '-1.5'])};"
+                       for name in names if rng.random() < 0.5)
+    body = '\n'.join(random_statement(rng, names, 2) for _ in range(6))
+    return f"{declarations}\n{initial}\n{body}\n"
+
+
+@pytest.fixture(scope='session')
+def random_programs():
+    rng = random.Random(2026)
+    programs = (random_program(rng) for _ in range(400))
+    return [source for source in programs if Compiler().compile_result(source)]
+
+
+def compile_program(source, optimize=False, fused=False):
+    compiler = Compiler()
+    result = compiler.compile_result(source, fused=fused, optimize=optimize)
+    assert result, result.error
+    return compiler
+
+
+def observe(run):
+    output = []
+    try:
+        run(output.append)
+    except ExecutionError:
+        output.append(ExecutionError)
+    return [value if value is ExecutionError else repr(value) for value in output]
+
+
+@pytest.fixture
+def run_vm():
+    def run(source, optimize=False, fused=False):
+        return observe(compile_program(source, optimize, fused).run)
+    return run
+
+
+@pytest.fixture
+def run_native():
+    def run(source, optimize=False, fused=False):
+        return observe(compile_program(source, optimize, fused).run_native)
+    return run
@@ -0,0 +1,44 @@
+import pytest
+from codigo_intermedio import ThreeAddressCode
+from conftest import EXAMPLES, observe
+from generador_python import PythonBackend
+from maquina_virtual import ExecutionError, VirtualMachine
+
+
+@pytest.mark.parametrize('path', EXAMPLES, ids=lambda path: path.rsplit('/', 1)[-1])
+def test_examples_match_the_vm(run_vm, run_native, path):
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    assert run_native(source) == run_vm(source)
+
+
+@pytest.mark.parametrize('fused', [False, True])
+def test_random_programs_match_the_vm(run_vm, run_native, random_programs, fused):
+    for source in random_programs:
+        assert run_native(source, fused=fused) == run_vm(source, fused=fused), source
+
+
+def test_variable_named_like_a_temporary(run_native):
+    assert run_native("var t0; t0 = 5; print((1 + 1) + t0);") == ['7']
+
+
+def test_division_by_zero_stops_execution(run_native):
+    assert run_native("var x; print(1); x = 0; print(1 / x); print(2);") == ['1', ExecutionError]
+
+
+def test_unstructured_code_uses_the_dispatch_loop():
+    code = [
+        ThreeAddressCode('ASSIGN', '0', None, 'x'),
+        ThreeAddressCode('GOTO', None, None, 'L1'),
+        ThreeAddressCode('LABEL', None, None, 'L0'),
+        ThreeAddressCode('PRINT', 'x'),
+        ThreeAddressCode('+', 'x', '1', 'x'),
+        ThreeAddressCode('LABEL', None, None, 'L1'),
+        ThreeAddressCode('<', 'x', '3', 't0'),
+        ThreeAddressCode('IF_TRUE', 't0', None, 'L0'),
+        ThreeAddressCode('PRINT', 'x'),
+    ]
+    backend = PythonBackend(code, {'x': 0})
+
+    assert not backend.structured
+    assert observe(backend.run) == observe(VirtualMachine(code, {'x': 0}).run) == ['0', '1', '2', '3']
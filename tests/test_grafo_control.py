@@ -0,0 +1,75 @@
+import pytest
+from codigo_intermedio import ThreeAddressCode
+from conftest import compile_program, observe
+from grafo_control import ControlFlowGraph
+from maquina_virtual import VirtualMachine
+
+
+SOURCE = """var a; var b;
+a = 0;
+while (a < 3) {
+    if (a == 1) { b = 2; } else { b = 3; }
+    a = a + 1;
+}
+print(b);
+"""
+
+
+@pytest.fixture
+def graph():
+    return ControlFlowGraph(compile_program(SOURCE).intermediate_code)
+
+
+def test_blocks_and_edges(graph):
+    assert graph.starts[0] == 0
+    assert all(graph.starts[block] < graph.ends[block] for block in range(len(graph)))
+    for block in range(len(graph)):
+        for target in graph.successors[block]:
+            assert block in graph.predecessors[target]
+
+
+def test_entry_dominates_every_reachable_block(graph):
+    for block in range(len(graph)):
+        assert graph.reachable(block)
+        assert graph.dominates(0, block)
+        assert graph.dominators(block)[-1] == 0
+
+
+def test_unreachable_block_has_no_dominator():
+    code = [
+        ThreeAddressCode('GOTO', None, None, 'L0'),
+        ThreeAddressCode('PRINT', '1'),
+        ThreeAddressCode('LABEL', None, None, 'L0'),
+        ThreeAddressCode('PRINT', '2'),
+    ]
+    graph = ControlFlowGraph(code)
+
+    assert [graph.reachable(block) for block in range(len(graph))] == [True, False, True]
+    assert graph.dominators(1) == []
+
+
+def test_undefined_label_is_rejected():
+    with pytest.raises(ValueError, match="L7"):
+        ControlFlowGraph([ThreeAddressCode('GOTO', None, None, 'L7')])
+
+
+def test_linearize_in_program_order_keeps_the_code(graph):
+    assert [str(instruction) for instruction in graph.linearize()] == [str(instruction) for instruction in graph.code]
+
+
+def test_linearize_in_any_order_keeps_behaviour(graph):
+    order = [0] + list(reversed(range(1, len(graph))))
+    code = graph.linearize(order)
+
+    assert observe(VirtualMachine(code).run) == observe(VirtualMachine(graph.code).run) == ['3']
+
+
+def test_linearize_does_not_change_the_graph(graph):
+    labels = list(graph.labels)
+    order = list(reversed(range(len(graph))))
+
+    first = [str(instruction) for instruction in graph.linearize(order)]
+    second = [str(instruction) for instruction in graph.linearize(order)]
+
+    assert first == second
+    assert graph.labels == labels
@@ -0,0 +1,95 @@
+import random
+import pytest
+from incremental import IncrementalParser, TextEdit
+from lexico import Lexer, LexicalError
+from sintactico import ASTNode, Parser, SyntaxError
+
+
+SOURCE = """var a;
+var b;
+a = 1;
+while (a < 3) {
+  b = a + 2;
+  if (b > 3) { print(b); }
+  a = a + 1;
+}
+print(a);
+"""
+
+
+def shape(node):
+    if isinstance(node, list):
+        return [shape(item) for item in node]
+    if isinstance(node, ASTNode):
+        return (type(node).__name__,) + tuple(
+            shape(getattr(node, name)) for name in node.__slots__ if name != 'symbol_id'
+        )
+    return node
+
+
+def full_parse(source):
+    lexer = Lexer(source)
+    return Parser(lexer.tokenize(), lexer.names).parse()
+
+
+def outcome(parse):
+    try:
+        return shape(parse().statements)
+    except (LexicalError, SyntaxError) as e:
+        return type(e)
+
+
+def test_editing_a_line_reuses_the_other_statements():
+    parser = IncrementalParser(SOURCE)
+    before = list(parser.program.statements)
+
+    parser.edit(TextEdit(3, 5, 3, 6, "7"))
+
+    after = parser.program.statements
+    assert parser.reparsed <= 2
+    assert after[2].expression.value == 7
+    assert after[0] is before[0]
+    assert all(old is new for old, new in zip(before[3:], after[3:]))
+
+
+def test_inserted_lines_shift_later_statements():
+    parser = IncrementalParser(SOURCE)
+    parser.edit(TextEdit(3, 1, 3, 1, "var c;\nc = 2;\n"))
+
+    assert shape(parser.program.statements) == shape(full_parse(parser.source).statements)
+    assert parser.program.statements[-1].line == 11
+
+
+def test_lexical_error_wins_over_syntax_error_as_in_a_full_compile():
+    parser = IncrementalParser(SOURCE)
+
+    with pytest.raises(LexicalError):
+        parser.edit(TextEdit(3, 1, 4, 1, "a = ;\nb = @;\n"))
+
+    parser.edit(TextEdit(3, 1, 5, 1, "a = 1;\n"))
+    assert shape(parser.program.statements) == shape(full_parse(parser.source).statements)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_random_edits_match_a_full_parse(seed):
+    rng = random.Random(seed)
+    pieces = ['x', '1', '+', ';', '\n', '(', ')', '{', '}', 'a = 2;\n', 'print(a);', '@', ' ', 'var c;\n', '']
+    parser = IncrementalParser(SOURCE)
+
+    for _ in range(500):
+        lines = parser.source.split('\n')
+        start_line = rng.randrange(len(lines))
+        start_column = rng.randrange(len(lines[start_line]) + 1)
+        end_line = min(len(lines) - 1, start_line + rng.randrange(2))
+        if end_line > start_line:
+            end_column = rng.randrange(len(lines[end_line]) + 1)
+        else:
+            end_column = rng.randrange(start_column, len(lines[start_line]) + 1)
+        text = rng.choice(pieces)
+
+        edited = '\n'.join(lines[:start_line] + [lines[start_line][:start_column] + text + lines[end_line][end_column:]]
+                           + lines[end_line + 1:])
+        edit = TextEdit(start_line + 1, start_column + 1, end_line + 1, end_column + 1, text)
+
+        assert outcome(lambda: parser.edit(edit)) == outcome(lambda: full_parse(edited))
+        assert parser.source == edited
@@ -0,0 +1,81 @@
+import io
+import pytest
+from lexico import Lexer, LexicalError, np
+
+
+SOURCES = [
+    "",
+    "var x;\nx = 10;\nprint(x);\n",
+    "var a; var b;\na = 3.25;\nb = 0.5 + a * 2.; // comentario\nif (a >= b) { print(a); } else { print(b); }\n",
+    "while (x != 0)\n{\n\tx = x - 1;\r\n}\n// ultimo comentario sin salto",
+    "var contador;\ncontador = 0;\nwhile (contador <= 5) {\n    contador = contador + 1;\n    print(contador == 3);\n}\n",
+    "x=1;y=2;z=x<y;w=x>y;\n\n\n   print((x + y) / (z - w));",
+]
+
+
+def signature(tokens):
+    return [(token.type, token.value, token.line, token.column) for token in tokens]
+
+
+def reference(source):
+    return signature(Lexer(source).tokenize_char_by_char())
+
+
+@pytest.fixture(params=range(len(SOURCES)))
+def source(request):
+    return SOURCES[request.param]
+
+
+def test_tokenize(source):
+    assert signature(Lexer(source).tokenize()) == reference(source)
+
+
+def test_iter_tokens(source):
+    assert signature(Lexer(source).iter_tokens()) == reference(source)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+def test_iter_tokens_from_stream(source, chunk_size):
+    tokens = Lexer('').iter_tokens(io.StringIO(source), chunk_size)
+    assert signature(tokens) == reference(source)
+
+
+def test_tokenize_buffer(source):
+    assert signature(Lexer(source).tokenize_buffer()) == reference(source)
+
+
+def test_tokenize_buffer_bytes(source):
+    assert signature(Lexer(source.encode('ascii')).tokenize_buffer()) == reference(source)
+
+
+def test_mapped_file(source, tmp_path):
+    path = tmp_path / 'programa.ml'
+    path.write_bytes(source.encode('ascii'))
+
+    with Lexer.from_mapped_file(str(path)) as lexer:
+        assert signature(lexer.tokenize_buffer()) == reference(source)
+
+
+def test_tokenize_parallel(source):
+    lexer = Lexer(source)
+    lexer.PARALLEL_THRESHOLD = 0
+    assert signature(lexer.tokenize_parallel(3)) == reference(source)
+
+
+@pytest.mark.skipif(np is None, reason="requiere NumPy")
+def test_tokenize_vectorized(source):
+    assert signature(Lexer(source).tokenize_vectorized()) == reference(source)
+
+
+def test_identifiers_share_name_ids():
+    tokens = Lexer("var x; x = x + y;").tokenize()
+    ids = [token.name_id for token in tokens if token.value in ('x', 'y')]
+    assert ids[0] == ids[1] == ids[2] != ids[3]
+
+
+@pytest.mark.parametrize('tokenize', [
+    Lexer.tokenize, Lexer.tokenize_buffer, Lexer.tokenize_char_by_char,
+])
+def test_unknown_character_is_a_lexical_error(tokenize):
+    with pytest.raises(LexicalError, match="linea 2, columna 3"):
+        tokenize(Lexer("var x;\nx @ 1;"))
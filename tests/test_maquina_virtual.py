@@ -0,0 +1,47 @@
+import pytest
+from codigo_intermedio import ThreeAddressCode
+from maquina_virtual import ExecutionError, VirtualMachine, divide
+
+
+@pytest.mark.parametrize('source, expected', [
+    ("var x; var y; x = 10; y = 20; print(x + y);", ['30']),
+    ("var x; x = 7; print(x / 2); print(-x / 2); print(x / -2);", ['3', '-3', '-3']),
+    ("var x; x = 7.0; print(x / 2);", ['3.5']),
+    ("var x; x = 1 < 2; print(x); print(x + 1);", ['True', '2']),
+    ("var x; x = 1.5; print(x * 2); print(0 * x);", ['3.0', '0.0']),
+    ("var x; print(x);", ['0']),
+    ("var c; c = 0; while (c < 3) { print(c); c = c + 1; }", ['0', '1', '2']),
+    ("var a; a = 2; if (a > 1) { print(1); } else { print(0); }", ['1']),
+    ("var x; x = 1; if (x == 1) { var x; x = 2; print(x); } print(x);", ['2', '1']),
+    ("var t0; t0 = 5; print((1 + 1) + t0);", ['7']),
+    ("var t1; var t0; t0 = 2; t1 = 3; print((t0 + 1) * (t1 + 1));", ['12']),
+])
+def test_programs(run_vm, source, expected):
+    assert run_vm(source) == expected
+
+
+def test_division_by_zero_stops_execution(run_vm):
+    assert run_vm("var x; print(1); x = 0; print(1 / x); print(2);") == ['1', ExecutionError]
+
+
+def test_division_truncates_towards_zero():
+    assert [divide(7, 2), divide(-7, 2), divide(7, -2), divide(-7, -2)] == [3, -3, -3, 3]
+    with pytest.raises(ExecutionError):
+        divide(1, 0)
+
+
+def test_undefined_label_is_rejected():
+    with pytest.raises(ExecutionError, match="L9"):
+        VirtualMachine([ThreeAddressCode('GOTO', None, None, 'L9')])
+
+
+def test_variables_and_steps():
+    code = [
+        ThreeAddressCode('ASSIGN', '2', None, 'x'),
+        ThreeAddressCode('*', 'x', '3', 't0'),
+        ThreeAddressCode('ASSIGN', 't0', None, 'y'),
+    ]
+    machine = VirtualMachine(code, {'x': 0, 'y': 1}).run()
+
+    assert machine.variables() == {'x': 2, 'y': 6}
+    assert machine.steps == 3
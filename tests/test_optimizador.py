@@ -0,0 +1,127 @@
+import pytest
+from codigo_intermedio import ThreeAddressCode
+from conftest import compile_program, observe
+from optimizador import ConstantFolder, DeadCodeEliminator
+
+
+def fold(code):
+    return [str(instruction) for instruction in ConstantFolder().optimize(code)]
+
+
+def test_random_programs_keep_their_output(run_vm, run_native, random_programs):
+    for source in random_programs:
+        expected = run_vm(source)
+        assert run_vm(source, optimize=True) == expected, source
+        assert run_native(source, optimize=True) == expected, source
+
+
+@pytest.mark.parametrize('source, expected', [
+    ("var x; var u; x = 1.5 + u; print(0 * x);", ['0.0']),
+    ("var x; var u; x = 1.5 + u; print(x * 0);", ['0.0']),
+    ("var a; var b; a = 1 < 2; b = a * 1; print(b);", ['1']),
+    ("var a; a = 1 < 2; print(a + 0); print(0 + a); print(a - 0); print(a / 1); print(+a);",
+     ['1', '1', '1', '1', '1']),
+    ("var x; x = -0.0; print(x + 0); print(0 + x); print(x - 0); print(x * 1);",
+     ['0.0', '0.0', '-0.0', '-0.0']),
+    ("var x; x = 7; print(x / 1); print(x * 0); print(x + 0);", ['7', '0', '7']),
+    ("print(7 / 2); print(-7 / 2); print(7.0 / 2);", ['3', '-3', '3.5']),
+    ("var x; print(x * 0); print(x + 0);", ['0', '0']),
+    ("print(1); print(1 / 0); print(2);", ['1', 'ExecutionError']),
+])
+def test_simplifications_keep_the_output(run_vm, source, expected):
+    unoptimized = run_vm(source)
+    assert run_vm(source, optimize=True) == unoptimized
+    assert [value if isinstance(value, str) else value.__name__ for value in unoptimized] == expected
+
+
+def test_folds_constant_temporaries():
+    code = [
+        ThreeAddressCode('+', '2', '3', 't0'),
+        ThreeAddressCode('*', 't0', '4', 't1'),
+        ThreeAddressCode('ASSIGN', 't1', None, 'x'),
+    ]
+    assert fold(code) == ['x = 20']
+
+
+def test_decides_literal_branches():
+    compiler = compile_program("var x; if (1 < 2) { x = 1; } else { x = 2; } print(x);", optimize=True)
+    ops = [instruction.op for instruction in compiler.intermediate_code]
+
+    assert 'IF_FALSE' not in ops
+    assert 'x = 2' not in [str(instruction) for instruction in compiler.intermediate_code]
+
+
+def test_keeps_division_by_zero():
+    assert fold([ThreeAddressCode('/', '1', '0', 't0'), ThreeAddressCode('PRINT', 't0')]) == [
+        't0 = 1 / 0', 'print t0',
+    ]
+
+
+def test_identities_need_a_known_numeric_operand():
+    code = [
+        ThreeAddressCode('<', 'a', 'b', 't0'),
+        ThreeAddressCode('ASSIGN', 't0', None, 'c'),
+        ThreeAddressCode('*', 'c', '1', 't1'),
+        ThreeAddressCode('+', 'd', '0', 't2'),
+        ThreeAddressCode('PRINT', 't1'),
+        ThreeAddressCode('PRINT', 't2'),
+    ]
+    assert fold(code) == ['t0 = a < b', 'c = t0', 't1 = c * 1', 'print t1', 'print d']
+
+
+def eliminate(code):
+    eliminator = DeadCodeEliminator()
+    return [str(instruction) for instruction in eliminator.optimize(code)], eliminator
+
+
+def test_dead_code_elimination_keeps_program_output(random_programs):
+    for source in random_programs:
+        compiler = compile_program(source)
+        expected = observe(compiler.run)
+        compiler.intermediate_code = DeadCodeEliminator().optimize(compiler.intermediate_code)
+        assert observe(compiler.run) == expected, source
+
+
+def test_removes_overwritten_and_unused_stores():
+    code = [
+        ThreeAddressCode('ASSIGN', '1', None, 'x'),
+        ThreeAddressCode('ASSIGN', '2', None, 'x'),
+        ThreeAddressCode('+', 'x', '1', 't0'),
+        ThreeAddressCode('ASSIGN', 't0', None, 'y'),
+        ThreeAddressCode('PRINT', 'x'),
+    ]
+    kept, eliminator = eliminate(code)
+
+    assert kept == ['x = 2', 'print x']
+    assert eliminator.dead_stores == 3
+
+
+def test_keeps_stores_read_around_a_loop():
+    source = "var i; var s; i = 0; s = 0; while (i < 3) { s = s + i; i = i + 1; } print(s);"
+    compiler = compile_program(source)
+    kept, eliminator = eliminate(compiler.intermediate_code)
+
+    assert eliminator.dead_stores == 0
+    assert len(kept) == len(compiler.intermediate_code)
+
+
+def test_removes_unreachable_blocks():
+    code = [
+        ThreeAddressCode('GOTO', None, None, 'L0'),
+        ThreeAddressCode('PRINT', '1'),
+        ThreeAddressCode('LABEL', None, None, 'L0'),
+        ThreeAddressCode('PRINT', '2'),
+    ]
+    kept, eliminator = eliminate(code)
+
+    assert kept == ['L0:', 'print 2']
+    assert eliminator.unreachable == 1
+
+
+def test_keeps_a_dead_division_that_may_fail():
+    code = [
+        ThreeAddressCode('/', '1', 'x', 't0'),
+        ThreeAddressCode('/', '1', '2', 't1'),
+        ThreeAddressCode('PRINT', '3'),
+    ]
+    assert eliminate(code)[0] == ['t0 = 1 / x', 'print 3']
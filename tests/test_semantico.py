@@ -0,0 +1,52 @@
+import pytest
+from compilador import Compiler
+from semantico import SemanticError
+
+
+HUGE_FLOAT = '9' * 400 + '.0'
+
+
+@pytest.mark.parametrize('fused', [False, True])
+def test_non_finite_literal_is_a_semantic_error(fused):
+    result = Compiler().compile_result(f"var x; x = {HUGE_FLOAT}; print(x);", fused=fused)
+
+    assert not result
+    assert isinstance(result.error, SemanticError)
+    assert [error.code for error in result.diagnostics.errors] == ['E006']
+
+
+def test_non_finite_literal_is_rejected_when_streaming():
+    emitted = []
+    compiler = Compiler()
+
+    assert not compiler.compile_stream(f"var x; x = {HUGE_FLOAT}; print(x);", emitted.append, verbose=False)
+    assert emitted == []
+    assert [error.code for error in compiler.diagnostics.errors] == ['E006']
+
+
+def test_large_finite_literal_is_accepted():
+    result = Compiler().compile_result("var x; x = 1" + '0' * 300 + ".0; print(x);")
+
+    assert result
+    assert result.diagnostics.error_count == 0
+
+
+def maybe_uninitialized(source, fused=False):
+    result = Compiler().compile_result(source, fused=fused)
+    assert result
+    return [(warning.line, warning.args[0]) for warning in result.diagnostics.warnings if warning.code == 'W001']
+
+
+@pytest.mark.parametrize('fused', [False, True])
+@pytest.mark.parametrize('source, expected', [
+    ("var x;\nprint(x);", [(2, 'x')]),
+    ("var x;\nx = 1;\nprint(x);", []),
+    ("var x;\nx = x + 1;", [(2, 'x')]),
+    ("var x; var c;\nc = 1;\nif (c > 0) { x = 1; }\nprint(x);", [(4, 'x')]),
+    ("var x; var c;\nc = 1;\nif (c > 0) { x = 1; } else { x = 2; }\nprint(x);", []),
+    ("var x; var c;\nc = 0;\nwhile (c < 3) { x = c; c = c + 1; }\nprint(x);", [(4, 'x')]),
+    ("var x; var c;\nc = 0;\nwhile (c < 3) {\nprint(x);\nx = c;\nc = c + 1;\n}", [(4, 'x')]),
+    ("var x; var c;\nx = 0; c = 0;\nwhile (c < 3) { print(x); c = c + 1; }", []),
+])
+def test_definite_assignment_follows_control_flow(source, expected, fused):
+    assert maybe_uninitialized(source, fused) == expected
@@ -0,0 +1,95 @@
+import pytest
+from lexico import Lexer
+from sintactico import (
+    AssignmentNode, BinaryOpNode, NumberNode, IdentifierNode, Parser, PrintNode,
+    SyntaxError, UnaryOpNode, VarDeclarationNode, WhileNode
+)
+
+
+def parse(source, recover=False):
+    lexer = Lexer(source)
+    parser = Parser(lexer.tokenize(), lexer.names, recover=recover)
+    return parser, parser.parse()
+
+
+def render(node):
+    stack = [node]
+    parts = []
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+        elif isinstance(node, BinaryOpNode):
+            stack.extend([')', node.right, f' {node.operator} ', node.left, '('])
+        elif isinstance(node, UnaryOpNode):
+            stack.extend([')', node.operand, f'({node.operator}'])
+        elif isinstance(node, NumberNode):
+            parts.append(str(node.value))
+        elif isinstance(node, IdentifierNode):
+            parts.append(node.name)
+
+    return ''.join(parts)
+
+
+def expression(text):
+    _, program = parse(f"x = {text};")
+    return render(program.statements[0].expression)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("1 + 2 * 3", "(1 + (2 * 3))"),
+    ("1 - 2 - 3", "((1 - 2) - 3)"),
+    ("8 / 4 / 2", "((8 / 4) / 2)"),
+    ("(1 + 2) * 3", "((1 + 2) * 3)"),
+    ("a < b + 1", "(a < (b + 1))"),
+    ("a + 1 == b * 2", "((a + 1) == (b * 2))"),
+    ("-a * b", "((-a) * b)"),
+    ("- -a", "(-(-a))"),
+    ("1 - -2", "(1 - (-2))"),
+    ("+a - b", "((+a) - b)"),
+])
+def test_operator_precedence_and_associativity(text, expected):
+    assert expression(text) == expected
+
+
+def test_deeply_nested_expression_does_not_recurse():
+    depth = 20000
+    text = '(' * depth + '1' + ')' * depth + ' + ' + ' + '.join(['2'] * depth)
+    _, program = parse(f"var x; x = {text};")
+    assert isinstance(program.statements[1], AssignmentNode)
+
+
+def test_deeply_nested_blocks_do_not_recurse():
+    depth = 5000
+    source = "var x; x = 0;\n" + "while (x < 1) {\n" * depth + "x = x + 1;\n" + "}\n" * depth
+    _, program = parse(source)
+
+    node = program.statements[2]
+    for _ in range(depth - 1):
+        assert isinstance(node, WhileNode)
+        node = node.body[0]
+    assert isinstance(node.body[0], AssignmentNode)
+
+
+def test_first_error_stops_without_recovery():
+    with pytest.raises(SyntaxError, match="linea 2"):
+        parse("var x;\nx = ;\nprint(x;\n")
+
+
+def test_recovery_reports_every_syntax_error():
+    parser, program = parse("var x;\nx = ;\nprint(x;\nvar y;\ny = 1 +;\nprint(y);\n", recover=True)
+
+    assert [error.rsplit('linea ', 1)[1] for error in parser.errors] == [
+        '2, columna 5', '3, columna 8', '5, columna 8',
+    ]
+    assert [type(statement) for statement in program.statements] == [
+        VarDeclarationNode, VarDeclarationNode, PrintNode,
+    ]
+
+
+def test_recovery_resumes_after_a_broken_block():
+    parser, program = parse("while (1 < ) {\n  print(1);\n}\nvar z;\nz = 2 2;\n", recover=True)
+
+    assert len(parser.errors) == 2
+    assert any(isinstance(statement, VarDeclarationNode) for statement in program.statements)